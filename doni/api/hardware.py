@@ -2,9 +2,9 @@ from flask import Blueprint, request
 
 from doni.api import utils as api_utils
 from doni.api.hooks import route
-from doni.common import args, driver_factory
+from doni.common import args, driver_factory, exception
 from doni.common.policy import authorize
-from doni.objects import transaction
+from doni.objects import read_transaction, transaction
 from doni.objects.availability_window import AvailabilityWindow
 from doni.objects.hardware import Hardware
 from doni.objects.worker_task import WorkerTask
@@ -62,53 +62,32 @@ AVAILABILITY_WINDOW_VALID_BASE = {
     "start": "2020-01-01T00:00:00Z",
     "end": "2020-01-01T00:00:00Z",
 }
+AVAILABILITY_WINDOW_VALIDATOR = args.schema(AVAILABILITY_WINDOW_SCHEMA)
 
 
 def hardware_validator():
     enabled_workers = driver_factory.worker_types()
-    enabled_hardware_types = driver_factory.hardware_types()
-
-    hardware_type_schemas = []
-    for hwt_name, hwt in enabled_hardware_types.items():
-        properties_schema = {
-            "type": "object",
-            "properties": {field.name: field.schema for field in hwt.default_fields},
-            "required": [field.name for field in hwt.default_fields if field.required],
-            # Disallow keys that don't match any worker
-            "additionalProperties": False,
-        }
-        for worker_name, worker in enabled_workers.items():
-            if worker_name not in hwt.enabled_workers:
-                continue
-            worker_schema = worker.json_schema()
-            properties_schema["properties"].update(worker_schema["properties"])
-            properties_schema["required"].extend(worker_schema["required"])
-
-        # JSONSchema doesn't like 'required' to be an empty array.
-        if not properties_schema["required"]:
-            del properties_schema["required"]
-
-        hardware_type_schemas.append(
-            {
-                "type": "object",
-                "properties": {
-                    "hardware_type": {"const": hwt_name},
-                    "properties": properties_schema,
-                },
-            }
-        )
-
-    schema = {
-        "definitions": {"hardware": HARDWARE_ENROLL_SCHEMA},
-        "allOf": [
-            # Check base hardware schema
-            {"$ref": "#/definitions/hardware"},
-            # Check schema for hardware types
-            {"oneOf": hardware_type_schemas},
-        ],
+    validate_hardware = args.schema(HARDWARE_ENROLL_SCHEMA)
+    # One validator per hardware type, so a payload is only checked against the
+    # schema of the hardware type it declares.
+    properties_validators = {
+        hwt_name: args.schema(hwt.properties_schema(enabled_workers))
+        for hwt_name, hwt in driver_factory.hardware_types().items()
     }
 
-    return args.schema(schema)
+    def _validate(name, value):
+        value = validate_hardware(name, value)
+        if value is None:
+            return
+        validate_properties = properties_validators.get(value["hardware_type"])
+        if not validate_properties:
+            raise exception.InvalidParameterValue(
+                f"Unsupported hardware type for {name}: {value['hardware_type']}"
+            )
+        validate_properties(f"{name}.properties", value["properties"])
+        return value
+
+    return _validate
 
 
 def hardware_serializer(with_private_fields=False):
@@ -138,7 +117,7 @@ def hardware_serializer(with_private_fields=False):
         properties = hardware_json["properties"].copy()
 
         hwt = globally_enabled_hardware_types[hardware.hardware_type]
-        worker_fields: "list[WorkerField]" = hwt.default_fields.copy()
+        worker_fields: "list[WorkerField]" = list(hwt.default_fields)
         for worker_type in hwt.enabled_workers:
             if worker_type not in globally_enabled_workers:
                 continue
@@ -180,21 +159,26 @@ def hardware_serializer(with_private_fields=False):
 def get_all():
     ctx = request.context
     project_id = None if request.args.get("all_projects") else ctx.project_id
-    limit = request.args.get("limit")
+    limit = api_utils.get_limit(request)
     marker = request.args.get("marker")
     sort_key = request.args.get("sort_key")
     sort_dir = request.args.get("sort_dir")
 
     authorize("hardware:get", ctx, {"project_id": project_id})
     serialize = hardware_serializer(with_private_fields=True)
-    hardwares = Hardware.list(
-        ctx,
-        limit=limit,
-        marker=marker,
-        sort_key=sort_key,
-        sort_dir=sort_dir,
-        project_id=project_id,
-    )
+    with read_transaction():
+        hardwares = Hardware.list(
+            ctx,
+            limit=limit,
+            marker=marker,
+            sort_key=sort_key,
+            sort_dir=sort_dir,
+            project_id=project_id,
+        )
+        # Also batch-fetch all associated worker tasks
+        worker_tasks = WorkerTask.list_for_hardwares(
+            ctx, [hw.uuid for hw in hardwares]
+        )
     links = []
     if hardwares and len(hardwares) == limit:
         links.append(
@@ -204,9 +188,6 @@ def get_all():
             }
         )
 
-    # Also batch-fetch all associated worker tasks
-    worker_tasks = WorkerTask.list_for_hardwares(ctx, [hw.uuid for hw in hardwares])
-
     return {
         "hardware": [serialize(hw, worker_tasks.get(hw.uuid)) for hw in hardwares],
         "links": links,
@@ -226,10 +207,11 @@ def export():
 @args.validate(hardware_uuid=args.uuid)
 def get_one(hardware_uuid=None):
     ctx = request.context
-    hardware = Hardware.get_by_uuid(ctx, hardware_uuid)
-    authorize("hardware:get", ctx, hardware)
+    with read_transaction():
+        hardware = Hardware.get_by_uuid(ctx, hardware_uuid)
+        authorize("hardware:get", ctx, hardware)
+        worker_tasks = WorkerTask.list_for_hardware(ctx, hardware_uuid)
     serialize = hardware_serializer(with_private_fields=True)
-    worker_tasks = WorkerTask.list_for_hardware(ctx, hardware_uuid)
     return serialize(hardware, worker_tasks=worker_tasks)
 
 
@@ -285,7 +267,7 @@ def update(hardware_uuid=None, patch=None):
             patch,
             prefix="/availability",
             allowed_fields=AVAILABILITY_WINDOW_UPDATE_ALLOWED_FIELDS,
-            validate_schema=args.schema(AVAILABILITY_WINDOW_SCHEMA),
+            validate_schema=AVAILABILITY_WINDOW_VALIDATOR,
             validation_base=AVAILABILITY_WINDOW_VALID_BASE,
         )
         # If updating availability windows, pull current values to compute the
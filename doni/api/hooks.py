@@ -1,3 +1,4 @@
+import os
 import traceback
 from functools import wraps
 from typing import TYPE_CHECKING
@@ -32,14 +33,30 @@ class AuthTokenFlaskMiddleware(object):
     """
 
     def __init__(self):
-        self.keystonemiddleware = AuthProtocol(
-            None,
-            {
-                "oslo_config_config": CONF,
-            },
-        )
+        self._keystonemiddleware = None
+        self._keystonemiddleware_pid = None
         self.public_paths = ["", "/v1/hardware/export"]
 
+    @property
+    def keystonemiddleware(self) -> "AuthProtocol":
+        """The wrapped auth_token middleware for the current process.
+
+        The app is created in the parent process before the API workers are
+        forked. The middleware holds HTTP sessions and token caches, which
+        should not be shared across processes, so it is built lazily (and
+        rebuilt after a fork) on first use in each worker.
+        """
+        pid = os.getpid()
+        if self._keystonemiddleware is None or self._keystonemiddleware_pid != pid:
+            self._keystonemiddleware = AuthProtocol(
+                None,
+                {
+                    "oslo_config_config": CONF,
+                },
+            )
+            self._keystonemiddleware_pid = pid
+        return self._keystonemiddleware
+
     def before_request(self):
         if request.path.rstrip("/") in self.public_paths:
             return
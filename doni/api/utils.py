@@ -7,10 +7,11 @@ from flask import make_response, request
 from oslo_log import log
 
 from doni.common import exception
+from doni.conf import CONF
 from doni.objects import fields as doni_fields
 
 if TYPE_CHECKING:
-    from typing import Type
+    from typing import Optional, Type
 
     from doni.common.context import RequestContext
     from doni.objects.base import DoniObject
@@ -353,6 +354,32 @@ def patch_validate_list(
             validate_schema(f"{prefix}/{item_idx}", doc)
 
 
+def get_limit(request) -> "Optional[int]":
+    """Get the page size requested with the ``limit`` query parameter.
+
+    Args:
+        request (Request): The API request.
+
+    Returns:
+        The limit, capped at ``[api]max_limit``, or None if no limit was given.
+
+    Raises:
+        InvalidParameterValue: if the limit is not a positive integer.
+    """
+    limit = request.args.get("limit")
+    if limit is None:
+        return None
+    try:
+        limit = int(limit)
+    except ValueError:
+        limit = 0
+    if limit < 1:
+        raise exception.InvalidParameterValue(
+            f"Expected a positive integer for limit: {request.args['limit']}"
+        )
+    return min(limit, CONF.api.max_limit)
+
+
 def get_next_href(request, marker=None):
     args = request.args.copy()
     if marker:
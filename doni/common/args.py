@@ -85,16 +85,15 @@ def array(schema, min_items=0):
     return {"type": "array", "items": schema, "minItems": min_items}
 
 
-def _validate_schema(name, value, schema):
+def _validate_schema(name, value, validator):
     if value is None:
         return
     try:
-        jsonschema.validate(
-            value,
-            schema,
-            cls=jsonschema.Draft7Validator,
-            format_checker=jsonschema.draft7_format_checker,
-        )
+        # Equivalent to jsonschema.validate, without re-checking the schema and
+        # constructing a new validator for every value.
+        error = jsonschema.exceptions.best_match(validator.iter_errors(value))
+        if error is not None:
+            raise error
     except jsonschema.exceptions.ValidationError as e:
         # The error message includes the whole schema which can be very
         # large and unhelpful, so truncate it to be brief and useful
@@ -121,8 +120,11 @@ def schema(schema):
         jsonschema.SchemaError: if the schema is not valid.
     """
     jsonschema.Draft7Validator.check_schema(schema)
+    validator = jsonschema.Draft7Validator(
+        schema, format_checker=jsonschema.draft7_format_checker
+    )
 
-    return partial(_validate_schema, schema=schema)
+    return partial(_validate_schema, validator=validator)
 
 
 def _inspect(function):
@@ -1,5 +1,10 @@
+import copy
+
 from oslo_context import context
 
+# A pre-built administrator context; see ``get_admin_context``.
+_ADMIN_TEMPLATE = None
+
 
 class RequestContext(context.RequestContext):
     """Extends security contexts from the oslo.context library."""
@@ -16,11 +21,22 @@ class RequestContext(context.RequestContext):
 
 
 def get_admin_context():
-    """Create an administrator context."""
-    context = RequestContext(
-        auth_token=None, project_id=None, is_admin=True, overwrite=False
-    )
-    return context
+    """Create an administrator context.
+
+    The context is a shallow copy of a module-level template, which avoids
+    running the full oslo.context constructor on every call. Each copy is
+    given its own request ID; other attributes can be freely reassigned on the
+    returned context, but mutable attributes (e.g., ``roles``) are shared with
+    the template and must not be mutated in place.
+    """
+    global _ADMIN_TEMPLATE
+    if _ADMIN_TEMPLATE is None:
+        _ADMIN_TEMPLATE = RequestContext(
+            auth_token=None, project_id=None, is_admin=True, overwrite=False
+        )
+    admin_context = copy.copy(_ADMIN_TEMPLATE)
+    admin_context.request_id = generate_request_id()
+    return admin_context
 
 
 def generate_request_id():
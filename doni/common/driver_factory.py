@@ -1,4 +1,5 @@
 import collections
+import types
 
 from oslo_concurrency import lockutils
 from oslo_log import log
@@ -22,7 +23,7 @@ EM_SEMAPHORE = "extension_manager"
 
 def _get_all_drivers(factory):
     """Get all drivers for `factory` as a dict name -> driver object."""
-    return {name: factory[name].obj for name in factory.names}
+    return factory.drivers
 
 
 def get_worker_type(worker_type) -> "BaseWorker":
@@ -112,6 +113,9 @@ class BaseDriverFactory(object):
     _enabled_driver_list = None
     # Template for logging loaded drivers
     _logging_template = "Loaded the following drivers: %s"
+    # Pair of (extension manager, read-only name -> driver mapping) built from
+    # it; rebuilt whenever the extension manager is replaced.
+    _drivers = None
 
     def __init__(self):
         if not self.__class__._extension_manager:
@@ -123,7 +127,21 @@ class BaseDriverFactory(object):
         return self._extension_manager[name]
 
     def get_driver(self, name):
-        return self[name].obj
+        return self.drivers[name]
+
+    @property
+    def drivers(self) -> "Mapping":
+        """A read-only mapping of driver name to driver instance."""
+        cls = self.__class__
+        extension_manager = cls._extension_manager
+        if cls._drivers is None or cls._drivers[0] is not extension_manager:
+            cls._drivers = (
+                extension_manager,
+                types.MappingProxyType(
+                    {ext.name: ext.obj for ext in extension_manager}
+                ),
+            )
+        return cls._drivers[1]
 
     # NOTE(tenbrae): Use lockutils to avoid a potential race in eventlet
     #             that might try to create two driver factories.
@@ -221,5 +239,7 @@ class WorkerTypeFactory(BaseDriverFactory):
 
     def on_load(self, extension):
         worker = extension.obj
-        if callable(getattr(worker, "register_opts", None)):
-            worker.register_opts(CONF)
+        # Resolve on the class to skip the per-instance attribute lookup.
+        register_opts = getattr(type(worker), "register_opts", None)
+        if register_opts is not None:
+            register_opts(worker, CONF)
@@ -1,6 +1,7 @@
 import collections
 from http import client as http_client
 import json
+import re
 
 from oslo_log import log
 
@@ -77,9 +78,16 @@ class DoniException(Exception):
     """
 
     _msg_fmt = "An unknown exception occurred."
+    # Names of the variables referenced in ``_msg_fmt``; computed once per
+    # subclass so that messages without variables can skip formatting.
+    _fmt_keys = ()
     code = http_client.INTERNAL_SERVER_ERROR
     safe = False
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fmt_keys = tuple(re.findall(r"%\((\w+)\)", cls._msg_fmt))
+
     def __init__(self, message=None, **kwargs):
 
         self.kwargs = _ensure_exception_kwargs_serializable(
@@ -94,7 +102,9 @@ class DoniException(Exception):
         else:
             self.code = int(kwargs["code"])
 
-        if not message:
+        if not message and not self._fmt_keys:
+            message = self._msg_fmt
+        elif not message:
             try:
                 message = self._msg_fmt % kwargs
 
@@ -138,6 +148,10 @@ class TemporaryFailure(DoniException):
     code = http_client.SERVICE_UNAVAILABLE
 
 
+class ConfigInvalid(DoniException):
+    _msg_fmt = "Invalid configuration file. %(error_msg)s"
+
+
 class InvalidParameterValue(Invalid):
     _msg_fmt = "%(msg)s"
 
@@ -1,28 +1,43 @@
+import functools
+import socket
+import sys
+
 from oslo_log import log
 from oslo_service import service
-from oslo_utils import importutils
 
-from doni import objects
 from doni import PROJECT_NAME
-from doni.common import config
 from doni.common import context as doni_context
 from doni.conf import CONF
-from doni.conf import opts
 
 LOG = log.getLogger(__name__)
 
+# NOTE: The FQDN lookup can block on misconfigured DNS, so it is done
+# once on service preparation rather than when the config module is imported.
+_cached_fqdn = functools.lru_cache(maxsize=None)(socket.getfqdn)
+
 
 def prepare_service(argv=None):
     """Initialize a service."""
+    # NOTE: These are imported here rather than at module level so that
+    # importing this module (e.g., from a CLI entrypoint) stays cheap; in
+    # particular, the object registry (and SQLAlchemy) is only loaded once
+    # arguments have been successfully parsed.
+    from doni.common import config
+    from doni.conf import opts
+
     argv = [] if argv is None else argv
     log.register_options(CONF)
     opts.update_opt_defaults()
     config.parse_args(argv)
+    if CONF.host is None:
+        CONF.set_default("host", _cached_fqdn())
     # NOTE(vdrok): We need to setup logging after argv was parsed, otherwise
     # it does not properly parse the options from config file and uses defaults
     # from oslo_log
     log.setup(CONF, PROJECT_NAME)
     # rpc.init(CONF)
+    from doni import objects
+
     objects.register_all()
 
 
@@ -33,10 +48,14 @@ def process_launcher():
 class DoniService(service.Service):
     def __init__(self, host, manager_module, manager_class):
         super().__init__()
-        manager_module = importutils.try_import(manager_module)
-        manager_class = getattr(manager_module, manager_class)
-        self.manager = manager_class(host)
-        self.name = f"{manager_module}.{manager_class}"
+        module = sys.modules.get(manager_module)
+        if module is None:
+            from oslo_utils import importutils
+
+            module = importutils.try_import(manager_module)
+        self.manager_class = getattr(module, manager_class)
+        self.manager = self.manager_class(host)
+        self.name = sys.intern(f"{module.__name__}.{self.manager_class.__name__}")
         self.host = host
 
     def start(self):
@@ -1,3 +1,5 @@
+import functools
+
 from oslo_concurrency import processutils
 from oslo_service import service
 from oslo_service import wsgi
@@ -9,6 +11,24 @@ from doni.conf import CONF
 
 _MAX_DEFAULT_WORKERS = 4
 
+# The CPU count does not change over the life of the process.
+_get_worker_count = functools.lru_cache(maxsize=None)(processutils.get_worker_count)
+
+
+def _db_pool_capacity():
+    """The most DB connections a single API worker process can hold open.
+
+    Returns:
+        The sum of the configured pool size and overflow, or None if either is
+            unset or the overflow is negative (unbounded.)
+    """
+    max_pool_size = CONF.database.max_pool_size
+    max_overflow = CONF.database.max_overflow
+    # NOTE: oslo.db uses a max_overflow of -1 to mean "no limit".
+    if max_pool_size is None or max_overflow is None or max_overflow < 0:
+        return None
+    return max_pool_size + max_overflow
+
 
 class WSGIService(service.ServiceBase):
     """Provides ability to launch doni API from wsgi app."""
@@ -26,12 +46,30 @@ class WSGIService(service.ServiceBase):
             CONF.api.api_workers
             # NOTE(dtantsur): each worker takes a substantial amount of memory,
             # so we don't want to end up with dozens of them.
-            or min(processutils.get_worker_count(), _MAX_DEFAULT_WORKERS)
+            or min(_get_worker_count(), _MAX_DEFAULT_WORKERS)
         )
         if self.workers and self.workers < 1:
             raise exception.ConfigInvalid(
-                _("api_workers value of %d is invalid, " "must be greater than 0.")
-                % self.workers
+                error_msg=(
+                    f"api_workers value of {self.workers} is invalid, "
+                    "must be greater than 0."
+                )
+            )
+
+        # NOTE: if unset, the server falls back to [DEFAULT]wsgi_default_pool_size.
+        self.worker_connections = CONF.api.worker_connections
+        db_pool_capacity = _db_pool_capacity()
+        if (
+            self.worker_connections
+            and db_pool_capacity
+            and self.worker_connections > db_pool_capacity
+        ):
+            raise exception.ConfigInvalid(
+                error_msg=(
+                    f"api.worker_connections value of {self.worker_connections} "
+                    "is invalid, must not exceed database.max_pool_size + "
+                    f"database.max_overflow ({db_pool_capacity})."
+                )
             )
 
         self.server = wsgi.Server(
@@ -40,6 +78,7 @@ class WSGIService(service.ServiceBase):
             self.app,
             host=CONF.api.host_ip,
             port=CONF.api.port,
+            pool_size=self.worker_connections,
             use_ssl=use_ssl,
         )
 
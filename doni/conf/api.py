@@ -41,6 +41,19 @@ opts = [
             "number cannot be detected."
         ),
     ),
+    cfg.IntOpt(
+        "worker_connections",
+        min=1,
+        help=(
+            "The number of greenthreads each doni API worker uses to serve "
+            "requests concurrently. Defaults to "
+            "[DEFAULT]wsgi_default_pool_size. Each worker has its own "
+            "database connection pool, so a value set here must not exceed "
+            "[database]max_pool_size + [database]max_overflow (unless the "
+            "overflow is unbounded); requests beyond that would only wait for "
+            "a free connection."
+        ),
+    ),
     cfg.BoolOpt(
         "enable_ssl_api",
         default=False,
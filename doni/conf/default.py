@@ -1,6 +1,5 @@
 from itertools import chain
 from os.path import abspath, join, dirname
-import socket
 import tempfile
 
 from oslo_config import cfg
@@ -29,7 +28,6 @@ path_opts = [
 service_opts = [
     cfg.StrOpt(
         "host",
-        default=socket.getfqdn(),
         sample_default="localhost",
         help=(
             "Name of this node. This can be an opaque identifier. "
@@ -37,7 +35,7 @@ service_opts = [
             "However, the node name must be valid within "
             "an AMQP key, and if using ZeroMQ (will be removed in "
             "the Stein release), a valid hostname, FQDN, "
-            "or IP address."
+            "or IP address. Defaults to the FQDN of the machine."
         ),
     ),
     cfg.StrOpt(
@@ -87,6 +85,17 @@ utils_opts = [
 worker_opts = [
     cfg.ListOpt("enabled_hardware_types", default=["baremetal"], help=("")),
     cfg.ListOpt("enabled_worker_types", default=["ironic"], help=("")),
+    cfg.BoolOpt(
+        "filter_worker_types_in_db",
+        default=False,
+        help=(
+            "Whether to filter out tasks of disabled worker types in the "
+            "database when looking up a hardware's worker tasks. By default "
+            "they are filtered out after loading, which is cheaper when few "
+            "worker types are enabled. Enable this if the database holds many "
+            "tasks for worker types that are no longer enabled."
+        ),
+    ),
 ]
 
-opts = chain(*[path_opts, service_opts, exc_log_opts, utils_opts, worker_opts])
+opts = list(chain(path_opts, service_opts, exc_log_opts, utils_opts, worker_opts))
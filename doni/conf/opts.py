@@ -1,3 +1,5 @@
+from oslo_config import cfg
+from oslo_db import options as db_options
 from oslo_log import log
 
 import doni.conf
@@ -31,23 +33,40 @@ def list_opts():
     return _opts
 
 
+_DEFAULT_LOG_LEVELS = (
+    "amqp=WARNING",
+    "amqplib=WARNING",
+    "qpid.messaging=INFO",
+    # This comes in two flavors
+    "oslo.messaging=INFO",
+    "oslo_messaging=INFO",
+    "sqlalchemy=WARNING",
+    "stevedore=INFO",
+    "eventlet.wsgi.server=INFO",
+    "iso8601=WARNING",
+    "requests=WARNING",
+    "urllib3.connectionpool=WARNING",
+    "keystonemiddleware.auth_token=INFO",
+    "keystoneauth.session=INFO",
+    "openstack=WARNING",
+)
+_defaults_applied = False
+
+
 def update_opt_defaults():
-    log.set_defaults(
-        default_log_levels=[
-            "amqp=WARNING",
-            "amqplib=WARNING",
-            "qpid.messaging=INFO",
-            # This comes in two flavors
-            "oslo.messaging=INFO",
-            "oslo_messaging=INFO",
-            "sqlalchemy=WARNING",
-            "stevedore=INFO",
-            "eventlet.wsgi.server=INFO",
-            "iso8601=WARNING",
-            "requests=WARNING",
-            "urllib3.connectionpool=WARNING",
-            "keystonemiddleware.auth_token=INFO",
-            "keystoneauth.session=INFO",
-            "openstack=WARNING",
-        ]
-    )
+    """Override default values of library options; only applied once per process."""
+    global _defaults_applied
+    if _defaults_applied:
+        return
+    log.set_defaults(default_log_levels=list(_DEFAULT_LOG_LEVELS))
+    # NOTE: oslo.db's own pool default (5) serializes concurrent API requests
+    # and worker tasks behind a handful of connections; raise it and bound how
+    # long a caller may wait for a connection. Connections are recycled well
+    # before common proxy/server idle timeouts; oslo.db already pings them on
+    # checkout. Reads use a separate engine (and pool) only when
+    # [database]slave_connection is set.
+    db_options.set_defaults(doni.conf.CONF, max_pool_size=10, pool_timeout=30)
+    # NOTE: db_options.set_defaults() does not accept connection_recycle_time
+    # in the oslo.db versions we support, so set it on the option directly.
+    cfg.set_defaults(db_options.database_opts, connection_recycle_time=1800)
+    _defaults_applied = True
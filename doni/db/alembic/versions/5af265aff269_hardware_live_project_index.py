@@ -0,0 +1,32 @@
+"""hardware_live_project_index
+
+Revision ID: 5af265aff269
+Revises: 868606f1faff
+Create Date: 2026-10-16 09:12:40.318204
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5af265aff269"
+down_revision = "868606f1faff"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Only live (deleted = 0) rows are listed; on backends that support it,
+    # leave soft-deleted hardware out of the index entirely.
+    op.create_index(
+        "hardware_live_project_id_idx",
+        "hardware",
+        ["project_id", "id"],
+        unique=False,
+        postgresql_where=sa.text("deleted = 0"),
+        sqlite_where=sa.text("deleted = 0"),
+    )
+
+
+def downgrade():
+    op.drop_index("hardware_live_project_id_idx", table_name="hardware")
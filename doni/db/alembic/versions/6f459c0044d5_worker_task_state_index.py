@@ -0,0 +1,22 @@
+"""worker_task_state_index
+
+Revision ID: 6f459c0044d5
+Revises: 5af265aff269
+Create Date: 2026-10-16 10:04:18.662031
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "6f459c0044d5"
+down_revision = "5af265aff269"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("worker_task_state_idx", "worker_task", ["state"], unique=False)
+
+
+def downgrade():
+    op.drop_index("worker_task_state_idx", table_name="worker_task")
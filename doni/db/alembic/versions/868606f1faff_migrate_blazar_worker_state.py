@@ -11,6 +11,11 @@ from alembic import op
 import sqlalchemy as sa
 from sqlalchemy.ext.automap import automap_base
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 # revision identifiers, used by Alembic.
 revision = "868606f1faff"
@@ -20,6 +25,17 @@ depends_on = None
 
 Base = automap_base()
 
+WORKER_TYPE = "blazar.physical_host"
+
+# How many worker tasks to load and update at a time.
+BATCH_SIZE = 1000
+
+# Mapping of old state detail key -> new state detail key.
+RENAMES = {
+    "blazar_host_id": "blazar_resource_id",
+    "host_created_at": "resource_created_at",
+}
+
 
 def _worker_task_model(bind):
     try:
@@ -31,44 +47,103 @@ def _worker_task_model(bind):
     return Base.classes.worker_task
 
 
-def upgrade():
-    """Update 'host' blazar worker fields to generic 'resource' naming."""
+def _rewrite(state_details: str, renames: dict) -> str:
+    """Rename keys in a JSON-encoded state details dict.
+
+    Uses orjson for decoding/encoding if it is installed, as this runs for
+    every matching row.
+    """
+    details = orjson.loads(state_details) if orjson else json.loads(state_details)
+    for old_key, new_key in renames.items():
+        if old_key in details:
+            details[new_key] = details.pop(old_key)
+    return orjson.dumps(details).decode() if orjson else json.dumps(details)
+
+
+_MYSQL_RENAME = sa.text(
+    "UPDATE worker_task "
+    "SET state_details = JSON_SET("
+    "JSON_REMOVE(state_details, :old_path), "
+    ":new_path, JSON_EXTRACT(state_details, :old_path)) "
+    "WHERE worker_type = :worker_type "
+    "AND JSON_CONTAINS_PATH(state_details, 'one', :old_path)"
+)
+_POSTGRESQL_RENAME = sa.text(
+    "UPDATE worker_task "
+    "SET state_details = ("
+    "(state_details::jsonb - :old_key) "
+    "|| jsonb_build_object(:new_key, state_details::jsonb -> :old_key)"
+    ")::text "
+    "WHERE worker_type = :worker_type "
+    "AND state_details::jsonb ? :old_key"
+)
+
+
+def _migrate_server_side(bind, renames: dict):
+    """Rename the keys with one UPDATE per key, evaluated in the database."""
+    for old_key, new_key in renames.items():
+        if bind.dialect.name == "mysql":
+            op.execute(
+                _MYSQL_RENAME.bindparams(
+                    old_path=f"$.{old_key}",
+                    new_path=f"$.{new_key}",
+                    worker_type=WORKER_TYPE,
+                )
+            )
+        else:
+            op.execute(
+                _POSTGRESQL_RENAME.bindparams(
+                    old_key=old_key, new_key=new_key, worker_type=WORKER_TYPE
+                )
+            )
+
+
+def _migrate(renames: dict):
+    """Rewrite blazar.physical_host state details.
+
+    On MySQL and PostgreSQL, this is done entirely server-side with the
+    database's JSON functions. Otherwise, only the ID and state details are
+    loaded, a batch at a time (using keyset pagination on the ID), and each
+    batch is written back with a single bulk update, so memory use is bounded
+    by the batch size rather than the table.
+    """
     bind = op.get_bind()
+    if bind.dialect.name in ("mysql", "postgresql"):
+        _migrate_server_side(bind, renames)
+        return
+
     session = sa.orm.Session(bind=bind)
 
     WorkerTask = _worker_task_model(bind)
 
-    for wt in session.query(WorkerTask).filter(
-        WorkerTask.worker_type == "blazar.physical_host"
-    ):
-        state_details = json.loads(wt.state_details)
-        if "blazar_host_id" in state_details:
-            state_details["blazar_resource_id"] = state_details["blazar_host_id"]
-            del state_details["blazar_host_id"]
-        if "host_created_at" in state_details:
-            state_details["resource_created_at"] = state_details["host_created_at"]
-            del state_details["host_created_at"]
-        wt.state_details = json.dumps(state_details)
-        session.add(wt)
-    session.commit()
+    last_id = 0
+    while True:
+        batch = (
+            session.query(WorkerTask.id, WorkerTask.state_details)
+            .filter(WorkerTask.worker_type == WORKER_TYPE)
+            .filter(WorkerTask.id > last_id)
+            .order_by(WorkerTask.id)
+            .limit(BATCH_SIZE)
+            .all()
+        )
+        if not batch:
+            break
+        last_id = batch[-1].id
+        session.bulk_update_mappings(
+            WorkerTask,
+            [
+                {"id": wt.id, "state_details": _rewrite(wt.state_details, renames)}
+                for wt in batch
+                if wt.state_details
+            ],
+        )
+        session.commit()
 
 
-def downgrade():
-    bind = op.get_bind()
-    session = sa.orm.Session(bind=bind)
+def upgrade():
+    """Update 'host' blazar worker fields to generic 'resource' naming."""
+    _migrate(RENAMES)
 
-    WorkerTask = _worker_task_model(bind)
 
-    for wt in session.query(WorkerTask).filter(
-        WorkerTask.worker_type == "blazar.physical_host"
-    ):
-        state_details = json.loads(wt.state_details)
-        if "blazar_resource_id" in state_details:
-            state_details["blazar_host_id"] = state_details["blazar_resource_id"]
-            del state_details["blazar_resource_id"]
-        if "resource_created_at" in state_details:
-            state_details["host_created_at"] = state_details["resource_created_at"]
-            del state_details["resource_created_at"]
-        wt.state_details = json.dumps(state_details)
-        session.add(wt)
-    session.commit()
+def downgrade():
+    _migrate({new_key: old_key for old_key, new_key in RENAMES.items()})
@@ -0,0 +1,24 @@
+"""availability_window_uuid_index
+
+Revision ID: 9a0c017d339e
+Revises: 6f459c0044d5
+Create Date: 2026-10-16 10:21:53.107428
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9a0c017d339e"
+down_revision = "6f459c0044d5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "availability_window_uuid_idx", "availability_window", ["uuid"], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index("availability_window_uuid_idx", table_name="availability_window")
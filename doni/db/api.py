@@ -1,14 +1,16 @@
-import itertools
+import functools
+import os
 import threading
+import types
+import uuid
 from typing import TYPE_CHECKING
 
 import sqlalchemy as sa
 from oslo_db import api as oslo_db_api
 from oslo_db import exception as db_exc
 from oslo_db.sqlalchemy import enginefacade
-from oslo_db.sqlalchemy import utils as db_utils
 from oslo_log import log
-from oslo_utils import uuidutils
+from oslo_utils import timeutils, uuidutils
 from osprofiler import sqlalchemy as osp_sqlalchemy
 from sqlalchemy.orm.exc import NoResultFound
 
@@ -18,17 +20,30 @@ from doni.db import models
 from doni.worker import WorkerState
 
 if TYPE_CHECKING:
-    from typing import ContextManager
+    from typing import ContextManager, Mapping
 
     from sqlalchemy.orm.session import Session
 
 LOG = log.getLogger(__name__)
 
 _CONTEXT = threading.local()
+_INSTANCE = None
+
+# Maximum number of values bound into a single IN list; longer lists are split
+# across several statements to stay within backend parameter limits.
+_IN_CHUNK_SIZE = 1000
 
 
 def get_instance():
-    return Connection()
+    """Return the shared DB API connection.
+
+    :class:`Connection` holds no state of its own (sessions are tracked in
+    ``_CONTEXT``), so one instance can safely be shared.
+    """
+    global _INSTANCE
+    if _INSTANCE is None:
+        _INSTANCE = Connection()
+    return _INSTANCE
 
 
 def _session_for_read() -> "ContextManager[Session]":
@@ -49,34 +64,256 @@ def _wrap_session(session):
 
 
 def _paginate_query(
-    model, limit=None, marker=None, sort_key=None, sort_dir=None, query=None
+    session, model, stmt, limit=None, marker=None, sort_key=None, sort_dir=None
 ):
-    if not query:
-        query = model_query(model)
+    """Apply keyset pagination to a select statement.
+
+    Rather than using an OFFSET, the page starts after the row identified by
+    ``marker``: its sort key values are compared (with the ID as a tie-breaker)
+    against each row, so the database can seek directly to the start of the
+    page using an index. NULLs in nullable sort keys are ordered before all
+    other values (after them when sorting descending) on every backend, and
+    are compared accordingly.
+
+    Args:
+        session (Session): The session, used to look up the marker.
+        model (models.Base): The model to paginate over.
+        stmt (Select): The select statement to paginate.
+        limit (int): The maximum number of results to return.
+        marker (str): The UUID of the last item on the previous page.
+        sort_key (str): The column to sort by; "id" is always used to break ties.
+        sort_dir (str): The sort direction, "asc" (the default) or "desc".
+
+    Returns:
+        The statement selecting the page of results.
+
+    Raises:
+        InvalidParameterValue: if the sort key or direction is invalid, or if
+            the marker does not match any result.
+    """
     sort_keys = ["id"]
     if sort_key and sort_key not in sort_keys:
         sort_keys.insert(0, sort_key)
-    try:
-        query = db_utils.paginate_query(
-            query, model, limit, sort_keys, marker=marker, sort_dir=sort_dir
-        )
-    except db_exc.InvalidSortKey:
+    if any(key not in model.__table__.columns for key in sort_keys):
         raise exception.InvalidParameterValue(
             ('The sort_key value "%(key)s" is an invalid field for sorting')
             % {"key": sort_key}
         )
-    return query.all()
-
+    sort_dir = sort_dir or "asc"
+    if sort_dir not in ("asc", "desc"):
+        raise exception.InvalidParameterValue(
+            ('The sort_dir value "%(dir)s" must be one of "asc" or "desc"')
+            % {"dir": sort_dir}
+        )
+    sort_columns = [model.__table__.columns[key] for key in sort_keys]
 
-def model_query(model, *args, **kwargs):
+    if marker is not None:
+        marker_stmt = stmt.with_only_columns(*sort_columns).where(
+            model.uuid == marker
+        )
+        marker_values = session.execute(marker_stmt).first()
+        if marker_values is None:
+            raise exception.InvalidParameterValue(
+                ('The marker "%(marker)s" could not be found') % {"marker": marker}
+            )
+        stmt = stmt.where(_after_marker(sort_columns, marker_values, sort_dir))
+
+    order_by = []
+    for column in sort_columns:
+        if column.nullable:
+            # Backends disagree on where NULLs sort, so order them explicitly.
+            order_by.append(column.isnot(None))
+        order_by.append(column)
+    if sort_dir == "asc":
+        stmt = stmt.order_by(*[key.asc() for key in order_by])
+    else:
+        stmt = stmt.order_by(*[key.desc() for key in order_by])
+    if limit:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+def _after_marker(sort_columns, marker_values, sort_dir):
+    """Build the criterion for rows that sort after the marker's values.
+
+    This is (c0 > v0) OR (c0 = v0 AND c1 > v1) OR ..., with ">" reversed for
+    descending sorts and NULL treated as lower than any other value.
+    """
+    criteria = []
+    for i, (column, value) in enumerate(zip(sort_columns, marker_values)):
+        if sort_dir == "asc":
+            after = column.isnot(None) if value is None else column > value
+        elif value is None:
+            # Nothing sorts after a NULL when descending.
+            continue
+        elif column.nullable:
+            after = sa.or_(column < value, column.is_(None))
+        else:
+            after = column < value
+        equal = [
+            prev_column.is_(None) if prev_value is None else prev_column == prev_value
+            for prev_column, prev_value in zip(sort_columns[:i], marker_values[:i])
+        ]
+        criteria.append(sa.and_(*equal, after))
+    return sa.or_(*criteria)
+
+
+def model_query(session, model, *args):
     """Query helper for simpler session usage.
 
+    The query must be run before ``session``'s transaction is exited.
+
     Args:
+        session (Session): The session to query with.
         model (models.Base): The model to query over.
     """
-    with _session_for_read() as session:
-        query = session.query(model, *args)
-        return query
+    return session.query(model, *args)
+
+
+def _update_by_uuid(session, model, by_uuid_stmt, uuid, values):
+    """Update the row with the given UUID and return it.
+
+    Where the backend supports ``UPDATE ... RETURNING`` the updated row is
+    returned by the UPDATE itself; otherwise it is re-selected with
+    ``by_uuid_stmt``. Either way, any instance of the row already in the
+    session is refreshed.
+
+    Args:
+        session (Session): The (write) session.
+        model (models.Base): The model to update.
+        by_uuid_stmt (Select): A select of ``model`` by a "uuid" bound parameter.
+        uuid (str): The UUID of the row to update.
+        values (dict): The column values to set.
+
+    Returns:
+        The updated model instance, or None if there is no row with the UUID.
+    """
+    stmt = (
+        sa.update(model)
+        .where(model.uuid == uuid)
+        .values(values)
+        .execution_options(synchronize_session=False)
+    )
+    if session.get_bind().dialect.full_returning:
+        stmt = stmt.returning(*model.__table__.columns)
+        orm_stmt = (
+            sa.select(model)
+            .from_statement(stmt)
+            .execution_options(populate_existing=True)
+        )
+        return session.execute(orm_stmt).scalar_one_or_none()
+    if session.execute(stmt).rowcount != 1:
+        return None
+    return session.execute(
+        by_uuid_stmt,
+        {"uuid": uuid},
+        execution_options={"populate_existing": True},
+    ).scalar_one()
+
+
+def _chunks(items: list, size: int):
+    """Yield successive slices of ``items`` of at most ``size`` items."""
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def _generate_uuids(count: int) -> "list[str]":
+    """Generate several random (version 4) UUIDs from one read of os.urandom.
+
+    Equivalent to calling ``uuidutils.generate_uuid`` ``count`` times, which
+    reads from the OS random source once per UUID.
+    """
+    buf = os.urandom(16 * count)
+    return [
+        str(uuid.UUID(bytes=buf[i : i + 16], version=4))
+        for i in range(0, len(buf), 16)
+    ]
+
+
+def _enabled_worker_types() -> "tuple[str]":
+    """The enabled worker types, sorted so bound parameters are deterministic."""
+    return tuple(sorted(driver_factory.worker_types()))
+
+
+# NOTE: frequently run statements are built once here and executed with bound
+# parameters, so each maps to one entry in SQLAlchemy's compiled SQL cache. The
+# IN lists are expanding bound parameters, so they also compile to a single
+# SQL string however many values are passed.
+_HARDWARE_BY_UUID = sa.select(models.Hardware).where(
+    models.Hardware.uuid == sa.bindparam("uuid"), models.Hardware.deleted == 0
+)
+_HARDWARE_BY_NAME = sa.select(models.Hardware).where(
+    models.Hardware.name == sa.bindparam("name")
+)
+_AVAILABILITY_WINDOW_BY_UUID = sa.select(models.AvailabilityWindow).where(
+    models.AvailabilityWindow.uuid == sa.bindparam("uuid")
+)
+_WORKER_TASK_BY_UUID = sa.select(models.WorkerTask).where(
+    models.WorkerTask.uuid == sa.bindparam("uuid")
+)
+_WORKER_TASKS_IN_STATE = sa.select(models.WorkerTask).where(
+    models.WorkerTask.state == sa.bindparam("state"),
+    models.WorkerTask.worker_type.in_(sa.bindparam("worker_types", expanding=True)),
+)
+_WORKER_TASKS_FOR_HARDWARE = sa.select(models.WorkerTask).where(
+    models.WorkerTask.hardware_uuid.in_(sa.bindparam("hardware_uuids", expanding=True))
+)
+_WORKER_TASK_STATES_FOR_HARDWARE = sa.select(
+    models.WorkerTask.hardware_uuid,
+    models.WorkerTask.worker_type,
+    models.WorkerTask.state,
+).where(
+    models.WorkerTask.hardware_uuid.in_(sa.bindparam("hardware_uuids", expanding=True))
+)
+
+
+def _for_enabled_worker_types(stmt):
+    """Filter a hardware worker task lookup to enabled worker types in SQL.
+
+    Only applied if [DEFAULT]filter_worker_types_in_db is set; otherwise
+    callers skip tasks for disabled worker types as they read the rows.
+    """
+    if not CONF.filter_worker_types_in_db:
+        return stmt
+    return stmt.where(
+        models.WorkerTask.worker_type.in_(
+            sa.bindparam("worker_types", expanding=True)
+        )
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _hardware_type_worker_fields(hardware_type, worker_types):
+    """Resolve the workers and worker field values for a hardware type.
+
+    Args:
+        hardware_type (BaseHardwareType): The hardware type.
+        worker_types (tuple[tuple[str, BaseWorker]]): The (name, worker) pairs
+            of all enabled worker types.
+
+    Returns:
+        A tuple of the names of the worker types enabled for the hardware type,
+            the default property values of their fields, and the property values
+            overridden by the hardware type. The mappings are read-only.
+    """
+    worker_types = dict(worker_types)
+    enabled_workers = []
+    defaults = {}
+    overrides = {}
+    for worker_type in hardware_type.enabled_workers:
+        if worker_type not in worker_types:
+            continue
+        enabled_workers.append(worker_type)
+        for field in worker_types[worker_type].fields:
+            if field.default:
+                defaults.setdefault(field.name, field.default)
+            if field.name in hardware_type.worker_overrides:
+                overrides[field.name] = hardware_type.worker_overrides[field.name]
+    return (
+        tuple(enabled_workers),
+        types.MappingProxyType(defaults),
+        types.MappingProxyType(overrides),
+    )
 
 
 class Connection(object):
@@ -92,35 +329,28 @@ class Connection(object):
         if initial_worker_state is not None:
             assert getattr(WorkerState, initial_worker_state, None) is not None
 
-        values.setdefault("uuid", uuidutils.generate_uuid())
-        hardware_uuid = values["uuid"]
-
         # Create one worker for each worker type we have enabled.
         hardware_type = driver_factory.get_hardware_type(values["hardware_type"])
-        enabled_worker_types = driver_factory.worker_types()
-        worker_tasks = []
-        for worker_type in hardware_type.enabled_workers:
-            if worker_type not in enabled_worker_types:
-                continue
-            for field in enabled_worker_types[worker_type].fields:
-                # Add in default fields
-                if field.default and field.name not in values:
-                    values["properties"].setdefault(field.name, field.default)
-                # Add in overrides from hardware type
-                if field.name in hardware_type.worker_overrides:
-                    values["properties"][field.name] = hardware_type.worker_overrides[
-                        field.name
-                    ]
-            task = models.WorkerTask()
-            task.update(
-                {
-                    "uuid": uuidutils.generate_uuid(),
-                    "hardware_uuid": hardware_uuid,
-                    "worker_type": worker_type,
-                    "state": initial_worker_state or WorkerState.PENDING,
-                }
-            )
-            worker_tasks.append(task)
+        worker_types, defaults, overrides = _hardware_type_worker_fields(
+            hardware_type, tuple(driver_factory.worker_types().items())
+        )
+        values["properties"] = {**defaults, **values["properties"], **overrides}
+
+        uuids = _generate_uuids(len(worker_types) + 1)
+        values.setdefault("uuid", uuids.pop())
+        hardware_uuid = values["uuid"]
+        task_mappings = [
+            {
+                "uuid": task_uuid,
+                "hardware_uuid": hardware_uuid,
+                "worker_type": worker_type,
+                "state": initial_worker_state or WorkerState.PENDING,
+                # Bulk inserts leave out unset columns rather than binding None
+                # like the ORM does, which would store NULL instead of "{}".
+                "state_details": {},
+            }
+            for worker_type, task_uuid in zip(worker_types, uuids)
+        ]
 
         hardware = models.Hardware()
         hardware.update(values)
@@ -131,8 +361,10 @@ class Connection(object):
                 # Flush the hardware INSERT so that the foreign key constraint
                 # for the worker tasks (on hardware UUID) can be satisfied.
                 session.flush()
-                for task in worker_tasks:
-                    session.add(task)
+                # Insert all tasks in one executemany rather than one INSERT
+                # per task through the unit of work.
+                if task_mappings:
+                    session.execute(sa.insert(models.WorkerTask), task_mappings)
             except db_exc.DBDuplicateEntry as exc:
                 if "name" in exc.columns:
                     raise exception.HardwareDuplicateName(name=values["name"])
@@ -141,17 +373,15 @@ class Connection(object):
 
     @oslo_db_api.retry_on_deadlock
     def backfill_worker_tasks(self) -> "list[models.WorkerTask]":
-        hardwares = {hw.uuid: hw for hw in self.get_hardware_list()}
-        worker_tasks = self.get_worker_tasks_for_hardware(hardwares.keys())
+        hardwares = {hw["uuid"]: hw for hw in self.get_hardware_summary_list()}
+        worker_task_states = self.get_worker_task_states_for_hardware(hardwares.keys())
 
         enabled_worker_types = driver_factory.worker_types()
 
-        missing_worker_tasks = []
+        missing = []
         for hardware_uuid, hw in hardwares.items():
-            hardware_type = driver_factory.get_hardware_type(hw.hardware_type)
-            existing_worker_types = [
-                wt.worker_type for wt in worker_tasks.get(hardware_uuid, [])
-            ]
+            hardware_type = driver_factory.get_hardware_type(hw["hardware_type"])
+            existing_worker_types = worker_task_states[hardware_uuid]
 
             for worker_type in hardware_type.enabled_workers:
                 if worker_type not in enabled_worker_types:
@@ -159,16 +389,22 @@ class Connection(object):
                 if worker_type in existing_worker_types:
                     # Worker already exists
                     continue
-                task = models.WorkerTask()
-                task.update(
-                    {
-                        "uuid": uuidutils.generate_uuid(),
-                        "hardware_uuid": hardware_uuid,
-                        "worker_type": worker_type,
-                        "state": WorkerState.PENDING,
-                    }
-                )
-                missing_worker_tasks.append(task)
+                missing.append((hardware_uuid, worker_type))
+
+        missing_worker_tasks = []
+        for (hardware_uuid, worker_type), task_uuid in zip(
+            missing, _generate_uuids(len(missing))
+        ):
+            task = models.WorkerTask()
+            task.update(
+                {
+                    "uuid": task_uuid,
+                    "hardware_uuid": hardware_uuid,
+                    "worker_type": worker_type,
+                    "state": WorkerState.PENDING,
+                }
+            )
+            missing_worker_tasks.append(task)
 
         with _session_for_write() as session:
             for task in missing_worker_tasks:
@@ -177,8 +413,14 @@ class Connection(object):
         return missing_worker_tasks
 
     @staticmethod
-    def _hardware_by_uuid(session, hardware_uuid: str):
-        return session.query(models.Hardware).filter_by(uuid=hardware_uuid, deleted=0)
+    def _load_hardware_for_update(session, hardware_uuid: str) -> "models.Hardware":
+        """Load and lock a hardware row for the rest of the transaction.
+
+        Raises:
+            NoResultFound: if there is no such (non-deleted) hardware.
+        """
+        stmt = _HARDWARE_BY_UUID.with_for_update()
+        return session.execute(stmt, {"uuid": hardware_uuid}).scalar_one()
 
     @oslo_db_api.retry_on_deadlock
     def update_hardware(self, hardware_uuid: str, values: dict) -> "models.Hardware":
@@ -187,46 +429,59 @@ class Connection(object):
             raise exception.InvalidParameterValue(msg=msg)
 
         with _session_for_write() as session:
-            query = self._hardware_by_uuid(session, hardware_uuid)
             try:
-                hardware = query.one()
-                hardware_type = driver_factory.get_hardware_type(hardware.hardware_type)
-                # Prevent updates to overridden fields
-                for field in hardware_type.worker_overrides.keys():
-                    del values[field]
+                hardware = self._load_hardware_for_update(session, hardware_uuid)
+                if "properties" in values:
+                    hardware_type = driver_factory.get_hardware_type(
+                        hardware.hardware_type
+                    )
+                    _, _, overrides = _hardware_type_worker_fields(
+                        hardware_type, tuple(driver_factory.worker_types().items())
+                    )
+                    # Prevent updates to overridden fields
+                    values["properties"] = {**values["properties"], **overrides}
                 hardware.update(values)
+                # Flush here so duplicate entries are caught below; the loaded
+                # instance is then current and does not need to be re-read.
+                session.flush()
             except NoResultFound:
                 raise exception.HardwareNotFound(hardware=hardware_uuid)
             except db_exc.DBDuplicateEntry as exc:
                 if "name" in exc.columns:
                     raise exception.HardwareDuplicateName(name=values["name"])
-                raise exception.HardwareAlreadyExists(uuid=values["uuid"])
-            return query.one()
+                raise exception.HardwareAlreadyExists(uuid=hardware_uuid)
+            return hardware
 
     @oslo_db_api.retry_on_deadlock
     def destroy_hardware(self, hardware_uuid: str):
         with _session_for_write() as session:
-            query = self._hardware_by_uuid(session, hardware_uuid)
-            try:
-                hardware = query.one()
-                hardware.soft_delete(session)
-            except NoResultFound:
+            # Equivalent to SoftDeleteMixin.soft_delete, without loading the row.
+            stmt = (
+                sa.update(models.Hardware)
+                .where(
+                    models.Hardware.uuid == hardware_uuid, models.Hardware.deleted == 0
+                )
+                .values(deleted=models.Hardware.id, deleted_at=timeutils.utcnow())
+                .execution_options(synchronize_session=False)
+            )
+            if session.execute(stmt).rowcount != 1:
                 raise exception.HardwareNotFound(hardware=hardware_uuid)
 
     def get_hardware_by_uuid(self, hardware_uuid: str) -> "models.Hardware":
         with _session_for_read() as session:
-            query = self._hardware_by_uuid(session, hardware_uuid)
             try:
-                return query.one()
+                params = {"uuid": hardware_uuid}
+                return session.execute(_HARDWARE_BY_UUID, params).scalar_one()
             except NoResultFound:
                 raise exception.HardwareNotFound(hardware=hardware_uuid)
 
     def get_hardware_by_name(self, hardware_name: str) -> "models.Hardware":
-        query = model_query(models.Hardware).filter_by(name=hardware_name)
-        try:
-            return query.one()
-        except NoResultFound:
-            raise exception.HardwareNotFound(hardware=hardware_name)
+        with _session_for_read() as session:
+            try:
+                params = {"name": hardware_name}
+                return session.execute(_HARDWARE_BY_NAME, params).scalar_one()
+            except NoResultFound:
+                raise exception.HardwareNotFound(hardware=hardware_name)
 
     def get_hardware_list(
         self,
@@ -236,29 +491,68 @@ class Connection(object):
         sort_dir=None,
         project_id=None,
         deleted=False,
-    ) -> "list[models.Hardware]":
-        query = model_query(models.Hardware)
+    ) -> "list[Mapping]":
+        """Get a page of hardware.
+
+        Rows are returned as plain column mappings rather than ORM instances;
+        this is only used to build (read-only) objects, and skipping instance
+        construction and identity-map bookkeeping makes large lists cheaper.
+
+        Returns:
+            A list of mappings of column name to value, one per hardware.
+        """
+        stmt = sa.select(models.Hardware.__table__)
         if not deleted:
-            query = query.filter_by(deleted=0)
+            stmt = stmt.where(models.Hardware.deleted == 0)
         if project_id:
-            query = query.filter_by(project_id=project_id)
-        return _paginate_query(
-            models.Hardware,
-            limit,
-            marker,
-            sort_key,
-            sort_dir,
-            query=query,
-        )
+            stmt = stmt.where(models.Hardware.project_id == project_id)
+        with _session_for_read() as session:
+            stmt = _paginate_query(
+                session,
+                models.Hardware,
+                stmt,
+                limit=limit,
+                marker=marker,
+                sort_key=sort_key,
+                sort_dir=sort_dir,
+            )
+            return session.execute(stmt).mappings().all()
+
+    def get_hardware_summary_list(self, project_id=None) -> "list[Mapping]":
+        """Get a summary of each (non-deleted) hardware.
+
+        Only the identifying columns are selected, so this avoids loading and
+        decoding each hardware's properties.
+
+        Args:
+            project_id (str): only include hardware under this project, if
+                specified.
+
+        Returns:
+            A list of mappings with the uuid, name, project_id, hardware_type
+                and created_at of each hardware.
+        """
+        stmt = sa.select(
+            models.Hardware.uuid,
+            models.Hardware.name,
+            models.Hardware.project_id,
+            models.Hardware.hardware_type,
+            models.Hardware.created_at,
+        ).where(models.Hardware.deleted == 0)
+        if project_id:
+            stmt = stmt.where(models.Hardware.project_id == project_id)
+        with _session_for_read() as session:
+            return session.execute(stmt).mappings().all()
 
     def get_hardware_availability_window_list(
         self, hardware_uuid: str
     ) -> "list[models.AvailabilityWindow]":
-        query = model_query(models.AvailabilityWindow).filter_by(
-            hardware_uuid=hardware_uuid
-        )
-        # TODO: how to communicate that hardware doesn't exist?
-        return query.all()
+        with _session_for_read() as session:
+            query = model_query(session, models.AvailabilityWindow).filter_by(
+                hardware_uuid=hardware_uuid
+            )
+            # TODO: how to communicate that hardware doesn't exist?
+            return query.all()
 
     @oslo_db_api.retry_on_deadlock
     def create_availability_window(self, values: dict) -> "models.AvailabilityWindow":
@@ -285,54 +579,82 @@ class Connection(object):
             raise exception.InvalidParameterValue(msg=msg)
 
         with _session_for_write() as session:
-            query = session.query(models.AvailabilityWindow).filter_by(uuid=window_uuid)
-            count = query.update(values)
-            if count != 1:
+            window = _update_by_uuid(
+                session,
+                models.AvailabilityWindow,
+                _AVAILABILITY_WINDOW_BY_UUID,
+                window_uuid,
+                values,
+            )
+            if window is None:
                 raise exception.AvailabilityWindowNotFound(window=window_uuid)
-            return query.one()
+            return window
 
     @oslo_db_api.retry_on_deadlock
     def destroy_availability_window(self, window_uuid: str):
         with _session_for_write() as session:
             query = session.query(models.AvailabilityWindow).filter_by(uuid=window_uuid)
-            try:
-                _ = query.one()
-            except NoResultFound:
+            count = query.delete(synchronize_session=False)
+            if count != 1:
                 raise exception.AvailabilityWindowNotFound(window=window_uuid)
-            query.delete()
 
     def get_availability_window_list(self) -> "list[models.AvailabilityWindow]":
-        query = model_query(models.AvailabilityWindow)
-        return query.all()
+        with _session_for_read() as session:
+            return model_query(session, models.AvailabilityWindow).all()
 
     def get_worker_tasks_in_state(
         self, state: "WorkerState"
     ) -> "list[models.WorkerTask]":
-        enabled_worker_types = driver_factory.worker_types().keys()
-        query = (
-            model_query(models.WorkerTask)
-            .filter(models.WorkerTask.state == state)
-            .filter(models.WorkerTask.worker_type.in_(enabled_worker_types))
-        )
-        return query.all()
+        params = {"state": state, "worker_types": _enabled_worker_types()}
+        with _session_for_read() as session:
+            return session.execute(_WORKER_TASKS_IN_STATE, params).scalars().all()
 
     def get_worker_tasks_for_hardware(
         self, hardware_uuids: "list[str]"
     ) -> "dict[str, list[models.WorkerTask]]":
-        enabled_worker_types = driver_factory.worker_types().keys()
-        query = (
-            model_query(models.WorkerTask)
-            .filter(models.WorkerTask.hardware_uuid.in_(hardware_uuids))
-            .filter(models.WorkerTask.worker_type.in_(enabled_worker_types))
-            .order_by(models.WorkerTask.hardware_uuid)
-        )
         # TODO: how to communicate that hardware doesn't exist?
-        return {
-            hw_uuid: list(wt_iter)
-            for hw_uuid, wt_iter in itertools.groupby(
-                query.all(), lambda wt: wt.hardware_uuid
-            )
-        }
+        worker_tasks = {hw_uuid: [] for hw_uuid in hardware_uuids}
+        enabled_worker_types = _enabled_worker_types()
+        stmt = _for_enabled_worker_types(_WORKER_TASKS_FOR_HARDWARE)
+        with _session_for_read() as session:
+            for uuids in _chunks(list(worker_tasks), _IN_CHUNK_SIZE):
+                params = {
+                    "hardware_uuids": uuids,
+                    "worker_types": enabled_worker_types,
+                }
+                for wt in session.execute(stmt, params).scalars():
+                    if wt.worker_type in enabled_worker_types:
+                        worker_tasks[wt.hardware_uuid].append(wt)
+        return worker_tasks
+
+    def get_worker_task_states_for_hardware(
+        self, hardware_uuids: "list[str]"
+    ) -> "dict[str, dict[str, str]]":
+        """Get the state of each enabled worker for a set of hardwares.
+
+        Unlike :meth:`get_worker_tasks_for_hardware`, this only selects the
+        columns needed and does not load ORM instances, so it is cheaper for
+        callers that do not need to modify the tasks.
+
+        Args:
+            hardware_uuids (list[str]): The hardware UUIDs to look up.
+
+        Returns:
+            A dict mapping each hardware UUID to a dict of worker type to state.
+        """
+        worker_task_states = {hw_uuid: {} for hw_uuid in hardware_uuids}
+        enabled_worker_types = _enabled_worker_types()
+        stmt = _for_enabled_worker_types(_WORKER_TASK_STATES_FOR_HARDWARE)
+        with _session_for_read() as session:
+            for uuids in _chunks(list(worker_task_states), _IN_CHUNK_SIZE):
+                params = {
+                    "hardware_uuids": uuids,
+                    "worker_types": enabled_worker_types,
+                }
+                for hw_uuid, worker_type, state in session.execute(stmt, params):
+                    if worker_type in enabled_worker_types:
+                        worker_task_states[hw_uuid][worker_type] = state
+        return worker_task_states
 
     @oslo_db_api.retry_on_deadlock
     def update_worker_task(
@@ -343,11 +665,17 @@ class Connection(object):
             raise exception.InvalidParameterValue(msg=msg)
 
         with _session_for_write() as session:
-            query = session.query(models.WorkerTask).filter_by(uuid=worker_task_uuid)
             try:
-                count = query.update(values)
-                if count != 1:
-                    raise exception.WorkerTaskNotFound(worker=worker_task_uuid)
+                worker_task = _update_by_uuid(
+                    session,
+                    models.WorkerTask,
+                    _WORKER_TASK_BY_UUID,
+                    worker_task_uuid,
+                    values,
+                )
             except db_exc.DBDuplicateEntry as exc:
-                raise exception.WorkerTaskAlreadyExists(uuid=values["uuid"])
-            return query.one()
+                LOG.debug("Duplicate entry on worker task columns %s", exc.columns)
+                raise exception.WorkerTaskAlreadyExists(uuid=worker_task_uuid)
+            if worker_task is None:
+                raise exception.WorkerTaskNotFound(worker=worker_task_uuid)
+            return worker_task
@@ -8,11 +8,25 @@ from urllib import parse as urlparse
 from oslo_db import options as db_options
 from oslo_db.sqlalchemy import models
 from oslo_db.sqlalchemy import types as db_types
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, orm, schema
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    String,
+    orm,
+    schema,
+    text,
+)
 from sqlalchemy.ext.declarative import declarative_base
 
 from doni.conf import CONF
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 _DEFAULT_SQL_CONNECTION = "sqlite:///" + path.join("$state_path", "doni.sqlite")
 
 
@@ -26,15 +40,53 @@ def table_args():
     return None
 
 
+# Evaluated once for all models; the connection URL does not change at runtime.
+_TABLE_ARGS = table_args()
+
+
+class JsonEncodedDict(db_types.JsonEncodedDict):
+    """Like oslo.db's JsonEncodedDict, but uses orjson when it is installed.
+
+    Stored values are the same JSON text either way, so the two are
+    interchangeable on existing columns.
+    """
+
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if orjson is None:
+            return super().process_bind_param(value, dialect)
+        if value is None:
+            value = self.type()
+        elif not isinstance(value, self.type):
+            raise TypeError(
+                "%s supposes to store %s objects, but %s given"
+                % (self.__class__.__name__, self.type.__name__, type(value).__name__)
+            )
+        # Like the json module, coerce non-string keys rather than failing.
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def process_result_value(self, value, dialect):
+        if orjson is None or value is None:
+            return super().process_result_value(value, dialect)
+        return orjson.loads(value)
+
+
 class DoniBase(models.TimestampMixin, models.ModelBase):
 
     metadata = None
 
+    @classmethod
+    def _column_names(cls) -> "tuple[str]":
+        # Cached per model class; the table's columns are fixed once mapped.
+        names = cls.__dict__.get("_column_names_cache")
+        if names is None:
+            names = tuple(c.name for c in cls.__table__.columns)
+            cls._column_names_cache = names
+        return names
+
     def as_dict(self):
-        d = {}
-        for c in self.__table__.columns:
-            d[c.name] = self[c.name]
-        return d
+        return {name: getattr(self, name) for name in self._column_names()}
 
 
 Base = declarative_base(cls=DoniBase)
@@ -45,14 +97,21 @@ class Hardware(models.SoftDeleteMixin, Base):
     __table_args__ = (
         schema.UniqueConstraint("uuid", name="uniq_hardware0uuid"),
         schema.UniqueConstraint("name", "deleted", name="uniq_hardware0name0deleted"),
-        table_args(),
+        schema.Index(
+            "hardware_live_project_id_idx",
+            "project_id",
+            "id",
+            postgresql_where=text("deleted = 0"),
+            sqlite_where=text("deleted = 0"),
+        ),
+        _TABLE_ARGS,
     )
     id = Column(Integer, primary_key=True)
     uuid = Column(String(36))
     project_id = Column(String(255))
     hardware_type = Column(String(64))
     name = Column(String(255))
-    properties = Column(db_types.JsonEncodedDict)
+    properties = Column(JsonEncodedDict)
     workers = orm.relationship(
         "WorkerTask", cascade="all, delete", passive_deletes=True
     )
@@ -67,7 +126,8 @@ class WorkerTask(models.SoftDeleteMixin, Base):
             "worker_type",
             name="uniq_workers0hardware_uuid0worker_type",
         ),
-        table_args(),
+        schema.Index("worker_task_state_idx", "state"),
+        _TABLE_ARGS,
     )
     id = Column(Integer, primary_key=True)
     uuid = Column(String(36))
@@ -79,14 +139,15 @@ class WorkerTask(models.SoftDeleteMixin, Base):
     )
     worker_type = Column(String(64))
     state = Column(String(15))
-    state_details = Column(db_types.JsonEncodedDict)
+    state_details = Column(JsonEncodedDict)
 
 
 class AvailabilityWindow(Base):
     __tablename__ = "availability_window"
     __table_args__ = (
         schema.Index("availability_window_hardware_uuid_idx", "hardware_uuid"),
-        table_args(),
+        schema.Index("availability_window_uuid_idx", "uuid"),
+        _TABLE_ARGS,
     )
     id = Column(Integer, primary_key=True)
     uuid = Column(String(36))
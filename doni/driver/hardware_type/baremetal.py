@@ -34,7 +34,7 @@ class Baremetal(BaseHardwareType):
         "ironic",
     )
 
-    default_fields = [
+    default_fields = (
         WorkerField(
             "management_address",
             schema=args.HOST_OR_IP,
@@ -55,4 +55,4 @@ class Baremetal(BaseHardwareType):
             default="x86_64",
             description=("The CPU architecture."),
         ),
-    ]
+    )
@@ -13,9 +13,11 @@
 # limitations under the License.
 
 import abc
+import types
 import typing
 
 if typing.TYPE_CHECKING:
+    from doni.driver.worker.base import BaseWorker
     from doni.worker import WorkerField
 
 
@@ -27,16 +29,51 @@ class BaseHardwareType(abc.ABC):
     Hardware update or create operation.
 
     Attributes:
-        enabled_workers (list[str]): A list of which workers can be enabled for
-            this hardware type.
-        default_fields (list[WorkerField]): A list of worker fields that apply
-            to this hardware type generically.
-        worker_overrides (dict): A dict of worker field names to the values that should
-            be overridden on the worker. This allows a hardware type to require that
-            a given worker field always has some set value, and prohibits the end-user
-            from choosing a different value.
+        enabled_workers (tuple[str]): Which workers can be enabled for this
+            hardware type.
+        default_fields (tuple[WorkerField]): The worker fields that apply to
+            this hardware type generically. This is a tuple, as it is shared
+            between all users of the hardware type.
+        worker_overrides (Mapping): A mapping of worker field names to the values
+            that should be overridden on the worker. This allows a hardware type to
+            require that a given worker field always has some set value, and
+            prohibits the end-user from choosing a different value. Subclasses
+            should wrap their overrides in a MappingProxyType, as they are shared.
     """
 
-    enabled_workers: "list[str]" = ()
-    default_fields: "list[WorkerField]" = []
-    worker_overrides: "dict" = {}
+    enabled_workers: "tuple[str, ...]" = ()
+    default_fields: "tuple[WorkerField, ...]" = ()
+    worker_overrides: "typing.Mapping[str, typing.Any]" = types.MappingProxyType({})
+
+    def properties_schema(self, worker_types: "dict[str, BaseWorker]") -> dict:
+        """Get the JSON schema for validating properties of this hardware type.
+
+        The schema covers the default fields and the fields of all workers that
+        are enabled both for this hardware type and globally, so hardware
+        properties can be checked in a single pass.
+
+        Args:
+            worker_types (dict[str, BaseWorker]): The globally enabled workers.
+
+        Returns:
+            The JSON schema for the hardware properties.
+        """
+        schema = {
+            "type": "object",
+            "properties": {field.name: field.schema for field in self.default_fields},
+            "required": [field.name for field in self.default_fields if field.required],
+            # Disallow keys that don't match any worker
+            "additionalProperties": False,
+        }
+        for worker_name, worker in worker_types.items():
+            if worker_name not in self.enabled_workers:
+                continue
+            worker_schema = worker.json_schema()
+            schema["properties"].update(worker_schema["properties"])
+            schema["required"].extend(worker_schema["required"])
+
+        # JSONSchema doesn't like 'required' to be an empty array.
+        if not schema["required"]:
+            del schema["required"]
+
+        return schema
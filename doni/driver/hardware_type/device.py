@@ -1,3 +1,5 @@
+from typing import NamedTuple
+
 from doni.common import args
 from doni.driver.hardware_type.base import BaseHardwareType
 from doni.worker import WorkerField
@@ -11,27 +13,35 @@ SUPPORTED_MACHINE_NAMES = [
     "raspberrypi3-64",
     "raspberrypi4-64",
 ]
-MACHINE_METADATA = {
-    "jetson-nano": {
-        "full_name": "Nvidia Jetson Nano SD-CARD",
-        "vendor": "Nvidia",
-        "model": "Jetson Nano",
-    },
-    "jetson-xavier-nx-emmc": {
-        "full_name": "Nvidia Jetson Xavier NX eMMC",
-        "vendor": "Nvidia",
-        "model": "Jetson Xavier NX",
-    },
-    "raspberrypi3-64": {
-        "full_name": "Raspberry Pi 3 (using 64bit OS)",
-        "vendor": "Raspberry Pi",
-        "model": "3",
-    },
-    "raspberrypi4-64": {
-        "full_name": "Raspberry Pi 4 (using 64bit OS)",
-        "vendor": "Raspberry Pi",
-        "model": "4",
-    },
+
+
+class MachineMetadata(NamedTuple):
+    full_name: str
+    vendor: str
+    model: str
+
+
+MACHINE_METADATA: "dict[str, MachineMetadata]" = {
+    "jetson-nano": MachineMetadata(
+        full_name="Nvidia Jetson Nano SD-CARD",
+        vendor="Nvidia",
+        model="Jetson Nano",
+    ),
+    "jetson-xavier-nx-emmc": MachineMetadata(
+        full_name="Nvidia Jetson Xavier NX eMMC",
+        vendor="Nvidia",
+        model="Jetson Xavier NX",
+    ),
+    "raspberrypi3-64": MachineMetadata(
+        full_name="Raspberry Pi 3 (using 64bit OS)",
+        vendor="Raspberry Pi",
+        model="3",
+    ),
+    "raspberrypi4-64": MachineMetadata(
+        full_name="Raspberry Pi 4 (using 64bit OS)",
+        vendor="Raspberry Pi",
+        model="4",
+    ),
 }
 
 SUPPORTED_CHANNEL_TYPES = ["wireguard"]
@@ -55,7 +65,7 @@ CHANNELS_SCHEMA = {
     "additionalProperties": False,
 }
 
-COMMON_FIELDS = [
+COMMON_FIELDS = (
     WorkerField(
         "machine_name",
         schema=args.enum(SUPPORTED_MACHINE_NAMES),
@@ -99,7 +109,7 @@ COMMON_FIELDS = [
             "profile are all available."
         ),
     ),
-]
+)
 
 
 class BalenaDevice(BaseHardwareType):
@@ -8,7 +8,7 @@ class Fake(BaseHardwareType):
 
     enabled_workers = ("fake-worker",)
 
-    default_fields = [
+    default_fields = (
         WorkerField("default_field", schema=args.STRING),
         WorkerField("default_required_field", schema=args.STRING, required=True),
-    ]
+    )
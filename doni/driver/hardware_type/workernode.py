@@ -34,7 +34,7 @@ class WorkerNode(BaseHardwareType):
         "k8s",
     )
 
-    default_fields = [
+    default_fields = (
         WorkerField(
             "machine_name",
             schema=args.STRING,
@@ -72,5 +72,5 @@ class WorkerNode(BaseHardwareType):
             default="x86_64",
             description=("The CPU architecture."),
         ),
-    ]
+    )
 
@@ -1,7 +1,8 @@
 from datetime import datetime, timezone
+import threading
 from typing import TYPE_CHECKING
 
-from oslo_config.cfg import DictOpt, StrOpt
+from oslo_config.cfg import DictOpt, IntOpt, StrOpt
 from oslo_log import log
 
 from doni.api import utils as api_utils
@@ -18,17 +19,69 @@ if TYPE_CHECKING:
 
 LOG = log.getLogger(__name__)
 BALENA_SDK = None
+_BALENA_SDK_LOCK = threading.Lock()
+# Fleets by name; fleet IDs are stable, so these are kept for the process lifetime.
+_FLEET_CACHE: "dict[str, dict]" = {}
+
+# Methods of the requests module that are routed through the pooled session.
+_SESSION_METHODS = frozenset(
+    ("request", "get", "head", "options", "post", "put", "patch", "delete")
+)
+
+
+class _PooledRequests(object):
+    """Stand-in for the requests module that sends requests over one session.
+
+    The Balena SDK calls the module-level requests functions, which open a new
+    connection (and TLS handshake) for every API call. Routing them through a
+    shared session keeps connections to the Balena API alive between calls.
+    """
+
+    def __init__(self, session):
+        self._session = session
+
+    def __getattr__(self, name):
+        import requests
+
+        if name in _SESSION_METHODS:
+            return getattr(self._session, name)
+        return getattr(requests, name)
+
+
+def _http_session():
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=CONF.balena.http_pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
 
 
 def _get_balena_sdk():
     global BALENA_SDK
-    if not BALENA_SDK:
-        from balena import Balena
+    if BALENA_SDK:
+        return BALENA_SDK
+    # Worker tasks run concurrently; make sure only one of them sets up the SDK,
+    # and that no task sees it before it is logged in.
+    with _BALENA_SDK_LOCK:
+        if not BALENA_SDK:
+            from balena import Balena, base_request
 
-        BALENA_SDK = Balena()
-        if CONF.balena.api_endpoint:
-            BALENA_SDK.settings.set("api_endpoint", CONF.balena.api_endpoint)
-        BALENA_SDK.auth.login_with_token(CONF.balena.api_token)
+            if hasattr(base_request, "requests"):
+                base_request.requests = _PooledRequests(_http_session())
+            else:
+                LOG.warning(
+                    "Balena SDK does not send requests through "
+                    "balena.base_request.requests; connections to the Balena "
+                    "API will not be reused."
+                )
+            balena = Balena()
+            if CONF.balena.api_endpoint:
+                balena.settings.set("api_endpoint", CONF.balena.api_endpoint)
+            balena.auth.login_with_token(CONF.balena.api_token)
+            BALENA_SDK = balena
     return BALENA_SDK
 
 
@@ -87,6 +140,16 @@ class BalenaWorker(BaseWorker):
                 "defined in the ``device_fleet_mapping`` must implement this service."
             ),
         ),
+        IntOpt(
+            "http_pool_size",
+            min=1,
+            default=10,
+            help=(
+                "The maximum number of connections to the Balena API kept open for "
+                "reuse. Connections are shared by all worker tasks; tasks that need "
+                "a connection when all are in use open a temporary one."
+            ),
+        ),
     ]
     opt_group = "balena"
 
@@ -108,22 +171,23 @@ class BalenaWorker(BaseWorker):
                 }
             )
 
-        balena_device = self._register_device(hardware)
-        self._sync_device_var(
-            hardware.uuid,
-            "OS_APPLICATION_CREDENTIAL_ID",
-            hardware.properties.get("application_credential_id"),
-            service_name=CONF.balena.credential_service_name,
-        )
-        self._sync_device_var(
+        device_id = self._to_device_id(hardware.uuid)
+        balena_device = self._register_device(hardware, device_id)
+        self._sync_device_vars(
             hardware.uuid,
-            "OS_APPLICATION_CREDENTIAL_SECRET",
-            hardware.properties.get("application_credential_secret"),
+            device_id,
+            {
+                "OS_APPLICATION_CREDENTIAL_ID": hardware.properties.get(
+                    "application_credential_id"
+                ),
+                "OS_APPLICATION_CREDENTIAL_SECRET": hardware.properties.get(
+                    "application_credential_secret"
+                ),
+            },
             service_name=CONF.balena.credential_service_name,
         )
 
         balena = _get_balena_sdk()
-        device_id = self._to_device_id(hardware.uuid)
 
         if "device_api_key" not in state_details:
             # Generate a device key and store on the state; the device owner (user)
@@ -145,11 +209,10 @@ class BalenaWorker(BaseWorker):
 
         return WorkerResult.Success(state_details)
 
-    def _register_device(self, hardware: "Hardware"):
+    def _register_device(self, hardware: "Hardware", device_id: str):
         from balena.exceptions import DeviceNotFound
 
         balena = _get_balena_sdk()
-        device_id = self._to_device_id(hardware.uuid)
         machine_name = hardware.properties.get("machine_name")
 
         device_types = {
@@ -157,36 +220,51 @@ class BalenaWorker(BaseWorker):
             for device_type in balena.models.device_type.get_all()
         }
 
-        def set_device_type():
-            # This function isn't available in the SDK but we can implement
-            # using some available primitives.
+        def update_device(data):
+            # Updating the device type isn't available in the SDK but we can
+            # implement using some available primitives. This also lets us send
+            # the name and type in a single request.
             return balena.models.device.base_request.request(
                 "device",
                 "PATCH",
                 params={"filter": "uuid", "eq": device_id},
-                data={"is_of__device_type": device_types[machine_name]},
+                data=data,
                 endpoint=balena.models.device.settings.get("pine_endpoint"),
             )
 
         try:
             device = balena.models.device.get(device_id)
+            changes = {}
             if device["device_name"] != hardware.name:
-                balena.models.device.rename(device_id, hardware.name)
-                LOG.info(f"Updated device name for {hardware.uuid}")
+                changes["device_name"] = hardware.name
             if device["is_of__device_type"]["__id"] != device_types[machine_name]:
-                set_device_type()
-                LOG.info(f"Updated device type for {hardware.uuid}")
+                changes["is_of__device_type"] = device_types[machine_name]
+            if changes:
+                update_device(changes)
+                LOG.info(f"Updated device {', '.join(changes)} for {hardware.uuid}")
         except DeviceNotFound:
             fleet_name = CONF.balena.device_fleet_mapping.get(machine_name)
             if not fleet_name:
                 raise ValueError(
                     f"No fleet is configured for machine name {machine_name}"
                 )
-            fleet = balena.models.application.get(fleet_name)
-            device = balena.models.device.register(fleet["id"], device_id)
+            fleet = _FLEET_CACHE.get(fleet_name)
+            if fleet is None:
+                fleet = balena.models.application.get(fleet_name)
+                _FLEET_CACHE[fleet_name] = fleet
+            try:
+                device = balena.models.device.register(fleet["id"], device_id)
+            except Exception:
+                # The fleet may have been re-created; look it up again next time.
+                _FLEET_CACHE.pop(fleet_name, None)
+                raise
             # Balena will have auto-assigned a device name, change to user-specified
-            balena.models.device.rename(device_id, hardware.name)
-            set_device_type()
+            update_device(
+                {
+                    "device_name": hardware.name,
+                    "is_of__device_type": device_types[machine_name],
+                }
+            )
             LOG.info(f"Registered new device for {hardware.uuid}")
             # Perform one additional fetch; when the device is returned from the
             # register endpoint, it is missing the belongs_to__application field,
@@ -203,9 +281,10 @@ class BalenaWorker(BaseWorker):
     def _to_device_id(self, hardware_uuid: str):
         return hardware_uuid.replace("-", "")
 
-    def _sync_device_var(self, hardware_uuid, key, value, service_name=None):
+    def _sync_device_vars(
+        self, hardware_uuid, device_id, desired: dict, service_name=None
+    ):
         balena = _get_balena_sdk()
-        device_id = self._to_device_id(hardware_uuid)
 
         if service_name:
             device_vars = (
@@ -214,16 +293,16 @@ class BalenaWorker(BaseWorker):
         else:
             device_vars = balena.models.environment_variables.device
 
-        existing = next(
-            iter([var for var in device_vars.get_all(device_id) if var["name"] == key]),
-            None,
-        )
-        if not existing:
-            if service_name:
-                device_vars.create(device_id, service_name, key, value)
-            else:
-                device_vars.create(device_id, key, value)
-            LOG.info(f"Created new device env var {key} for {hardware_uuid}")
-        elif existing["value"] != value:
-            device_vars.update(existing["id"], value)
-            LOG.info(f"Updated device env var {key} for {hardware_uuid}")
+        # Fetch the current vars once and diff all desired vars against them
+        existing_vars = {var["name"]: var for var in device_vars.get_all(device_id)}
+        for key, value in desired.items():
+            existing = existing_vars.get(key)
+            if not existing:
+                if service_name:
+                    device_vars.create(device_id, service_name, key, value)
+                else:
+                    device_vars.create(device_id, key, value)
+                LOG.info(f"Created new device env var {key} for {hardware_uuid}")
+            elif existing["value"] != value:
+                device_vars.update(existing["id"], value)
+                LOG.info(f"Updated device env var {key} for {hardware_uuid}")
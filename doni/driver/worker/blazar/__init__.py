@@ -1,19 +1,25 @@
 from datetime import datetime
+from functools import partial
+import time
 from typing import TYPE_CHECKING
 
 from dateutil.parser import parse
+import futurist
 from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_utils import uuidutils
 from pytz import UTC
 
 from doni.common import args, exception, keystone
+from doni.conf import CONF
 from doni.conf import auth as auth_conf
 from doni.driver.util import ks_service_requestor, KeystoneServiceAPIError
 from doni.driver.worker.base import BaseWorker
 from doni.worker import WorkerField, WorkerResult
 
 if TYPE_CHECKING:
+    from typing import Callable
+
     from doni.common.context import RequestContext
     from doni.objects.availability_window import AvailabilityWindow
     from doni.objects.hardware import Hardware
@@ -25,8 +31,15 @@ BLAZAR_API_MICROVERSION = "1.0"
 BLAZAR_DATE_FORMAT = "%Y-%m-%d %H:%M"
 _BLAZAR_ADAPTER = None
 _KEYSTONE_ADAPTER = None
+# All of Blazar's leases as (fetched at, leases), shared by every hardware's sync.
+_LEASE_LIST = None
+# Bumped whenever leases change, so a listing started before the change is not
+# stored once it completes.
+_LEASE_LIST_GENERATION = 0
 
 AW_LEASE_PREFIX = "availability_window_"
+# Most lease requests sent to Blazar at once while syncing one hardware's windows.
+LEASE_SYNC_CONCURRENCY = 16
 
 
 class BlazarIsWrongError(exception.DoniException):
@@ -68,13 +81,46 @@ def call_keystone(*args, **kwargs):
     return ks_service_requestor("Keystone", _get_keystone_adapter)(*args, **kwargs)
 
 
+def _run_concurrently(calls: "list[Callable[[], WorkerResult.Base]]"):
+    """Run independent Blazar calls on green threads and return their results.
+
+    Results are returned in the order of the calls. If any call raised, the
+    first such exception is re-raised once all calls have finished.
+    """
+    if len(calls) < 2:
+        return [call() for call in calls]
+    with futurist.GreenThreadPoolExecutor(
+        max_workers=min(len(calls), LEASE_SYNC_CONCURRENCY)
+    ) as executor:
+        futures = [executor.submit(call) for call in calls]
+    return [future.result() for future in futures]
+
+
+def _invalidate_lease_list():
+    global _LEASE_LIST, _LEASE_LIST_GENERATION
+    _LEASE_LIST_GENERATION += 1
+    _LEASE_LIST = None
+
+
 class BaseBlazarWorker(BaseWorker):
     """A base Blazar worker that syncs a Hardware to some Blazar resource.
 
     The base worker also handles managing availability windows for the resource.
     """
 
-    opts = []
+    opts = [
+        cfg.IntOpt(
+            "lease_list_cache_ttl",
+            min=0,
+            default=15,
+            help=(
+                "How long, in seconds, to reuse Blazar's list of leases when syncing "
+                "availability windows for several hardware items, instead of "
+                "listing all leases again for each one. The list is refreshed as "
+                "soon as the worker changes a lease. Set to 0 to always list leases."
+            ),
+        ),
+    ]
     opt_group = "blazar"
 
     # How will the resource be looked up?
@@ -235,7 +281,9 @@ class BaseBlazarWorker(BaseWorker):
         # Get all leases from blazar
         leases_to_check = self._lease_list(context, hardware)
 
-        lease_results = []
+        # Each window needs at most a couple of dependent requests, but windows are
+        # independent of each other, so their requests are sent concurrently.
+        lease_calls = []
         # Loop over all availability windows that Doni has for this hw item
         for aw in availability_windows or []:
             new_lease = self.to_lease(aw)
@@ -253,8 +301,8 @@ class BaseBlazarWorker(BaseWorker):
                 # Pop each existing lease from the list. Any remaining at the end will be removed.
                 leases_to_check.pop(matching_index)
                 lease_for_update = new_lease.copy()
-                # Do not attempt to update reservations; we only support updating
-                # the start and end date.
+                # Reservations are never updated, so leave them out of the
+                # comparison.
                 lease_for_update.pop("reservations", None)
 
                 if lease_for_update.items() <= matching_lease.items():
@@ -274,23 +322,34 @@ class BaseBlazarWorker(BaseWorker):
                     # after it has already been entered in to Blazar. This is not
                     # strictly allowed by Blazar (updating start time after lease begins)
                     # but we can fake it with a delete/create.
-                    lease_results.append(
-                        self._lease_delete(context, matching_lease["id"])
+                    lease_calls.append(
+                        partial(
+                            self._lease_replace,
+                            context,
+                            matching_lease["id"],
+                            new_lease,
+                        )
                     )
-                    lease_results.append(self._lease_create(context, new_lease))
                 else:
-                    lease_results.append(
-                        self._lease_update(
-                            context, matching_lease["id"], lease_for_update
+                    lease_calls.append(
+                        partial(
+                            self._lease_update,
+                            context,
+                            matching_lease["id"],
+                            new_lease,
                         )
                     )
             else:
-                lease_results.append(self._lease_create(context, new_lease))
+                lease_calls.append(partial(self._lease_create, context, new_lease))
 
-        delete_results = []
+        lease_results = _run_concurrently(lease_calls)
         # Delete any leases that are in blazar, but not in the desired availability window.
-        for lease in leases_to_check:
-            delete_results.append(self._lease_delete(context, lease["id"]))
+        delete_results = _run_concurrently(
+            [
+                partial(self._lease_delete, context, lease["id"])
+                for lease in leases_to_check
+            ]
+        )
 
         if any(
             isinstance(res, WorkerResult.Defer)
@@ -391,15 +450,25 @@ class BaseBlazarWorker(BaseWorker):
 
     def _lease_list(self, context: "RequestContext", hardware: "Hardware"):
         """Get list of all leases from blazar. Return dict of blazar response."""
-        # List of all leases from blazar.
-        lease_list_response = call_blazar(
-            context,
-            "/leases",
-            method="get",
-        )
+        # List of all leases from blazar. Listing every lease is expensive, so a
+        # recent listing is shared between hardware items.
+        global _LEASE_LIST
+        cached = _LEASE_LIST
+        if cached and time.monotonic() - cached[0] < CONF.blazar.lease_list_cache_ttl:
+            all_leases = cached[1]
+        else:
+            generation = _LEASE_LIST_GENERATION
+            fetched_at = time.monotonic()
+            all_leases = call_blazar(
+                context,
+                "/leases",
+                method="get",
+            ).get("leases")
+            if generation == _LEASE_LIST_GENERATION:
+                _LEASE_LIST = (fetched_at, all_leases)
         return [
             lease
-            for lease in lease_list_response.get("leases")
+            for lease in all_leases
             # Perform a bit of a kludgy check to see if the UUID appears at
             # all in the nested JSON string representing the reservation
             # contraints.
@@ -428,40 +497,65 @@ class BaseBlazarWorker(BaseWorker):
                 return WorkerResult.Defer(reason="Conflicts with existing lease")
             raise
         else:
+            _invalidate_lease_list()
             result["lease_created_at"] = lease.get("created_at")
             return WorkerResult.Success(result)
 
     def _lease_update(
         self, context: "RequestContext", lease_id: "str", new_lease: "dict"
     ) -> WorkerResult.Base:
-        """Update blazar lease if necessary. Return result dict."""
+        """Update blazar lease if necessary. Return result dict.
+
+        If the lease no longer exists in Blazar, e.g. because it was deleted
+        after the lease list was fetched, it is created again instead.
+        """
         result = {}
+        lease_for_update = new_lease.copy()
+        # Do not attempt to update reservations; we only support updating
+        # the start and end date.
+        lease_for_update.pop("reservations", None)
         try:
             response = call_blazar(
                 context,
                 f"/leases/{lease_id}",
                 method="put",
-                json=new_lease,
+                json=lease_for_update,
             ).get("lease")
         except KeystoneServiceAPIError as exc:
             if exc.code == 404:
-                return WorkerResult.Defer(reason="Resource not found")
+                _invalidate_lease_list()
+                return self._lease_create(context, new_lease)
             elif exc.code == 409:
                 return WorkerResult.Defer(reason="Conflicts with existing lease")
             raise
         else:
+            _invalidate_lease_list()
             result["updated_at"] = response.get("updated_at")
             return WorkerResult.Success(result)
 
+    def _lease_replace(
+        self, context: "RequestContext", lease_id: "str", new_lease: "dict"
+    ) -> WorkerResult.Base:
+        """Replace a Blazar lease by deleting it and creating the new lease."""
+        result = self._lease_delete(context, lease_id)
+        if isinstance(result, WorkerResult.Defer):
+            return result
+        return self._lease_create(context, new_lease)
+
     def _lease_delete(
         self, context: "RequestContext", lease_id: "str"
     ) -> WorkerResult.Base:
-        """Delete Blazar lease."""
-        call_blazar(
-            context,
-            f"/leases/{lease_id}",
-            method="delete",
-        )
+        """Delete Blazar lease. A lease that is already gone counts as deleted."""
+        try:
+            call_blazar(
+                context,
+                f"/leases/{lease_id}",
+                method="delete",
+            )
+        except KeystoneServiceAPIError as exc:
+            if exc.code != 404:
+                raise
+        _invalidate_lease_list()
         return WorkerResult.Success()
 
     def _find_resource(self, context: "RequestContext", name: "str") -> dict:
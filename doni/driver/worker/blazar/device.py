@@ -2,7 +2,6 @@ from typing import TYPE_CHECKING
 
 from oslo_log import log as logging
 
-from doni.driver.hardware_type.device import MACHINE_METADATA
 from doni.driver.worker.blazar import BaseBlazarWorker
 from doni.worker import WorkerField
 
@@ -1,5 +1,7 @@
 from typing import TYPE_CHECKING
 
+from oslo_log import log
+
 from doni.driver.worker.base import BaseWorker
 from doni.worker import WorkerField, WorkerResult
 
@@ -9,6 +11,9 @@ if TYPE_CHECKING:
     from doni.objects.hardware import Hardware
 
 
+LOG = log.getLogger(__name__)
+
+
 class FakeWorker(BaseWorker):
 
     fields = [
@@ -26,7 +31,7 @@ class FakeWorker(BaseWorker):
         availability_windows: "list[AvailabilityWindow]" = [],
         state_details: "dict" = None,
     ) -> "WorkerResult.Base":
-        print(f"fake: processing hardware {hardware.uuid}")
+        LOG.debug("fake: processing hardware %s", hardware.uuid)
         return WorkerResult.Success(
             {
                 "fake-result": hardware.uuid,
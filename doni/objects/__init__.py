@@ -10,6 +10,18 @@ def transaction():
         yield
 
 
+@contextmanager
+def read_transaction():
+    """A helper context manager for running several object reads together.
+
+    Reads made inside share one database transaction (and connection) instead
+    of each opening their own. Writes are not allowed inside; use
+    :func:`transaction` for those.
+    """
+    with db_api._session_for_read():
+        yield
+
+
 def register_all():
     from doni.objects.availability_window import AvailabilityWindow
     from doni.objects.hardware import Hardware
@@ -124,6 +124,34 @@ def test_get_all_hardware_all_projects_admin(
     _assert_hardware_json_ok(res.json["hardware"][0], _with_masked_sensitive_fields(hw))
 
 
+@pytest.mark.parametrize("limit", ["abc", "0", "-1"])
+def test_get_all_hardware_invalid_limit(
+    limit, user_auth_headers, client: "FlaskClient", database: "utils.DBFixtures"
+):
+    database.add_hardware()
+    res = client.get(f"/v1/hardware?limit={limit}", headers=user_auth_headers)
+    assert res.status_code == 400
+    assert "hardware" not in res.json
+
+
+def test_get_all_hardware_limit_capped(
+    mocker,
+    test_config,
+    user_auth_headers,
+    user_project_id,
+    client: "FlaskClient",
+    database: "utils.DBFixtures",
+):
+    mocker.patch("doni.api.hardware.authorize")
+    test_config.config(group="api", max_limit=1)
+    for _ in range(2):
+        database.add_hardware(project_id=user_project_id)
+    res = client.get("/v1/hardware?limit=5", headers=user_auth_headers)
+    assert res.status_code == 200
+    assert len(res.json["hardware"]) == 1
+    assert res.json["links"][0]["rel"] == "next"
+
+
 def test_get_one_hardware(
     mocker, user_auth_headers, client: "FlaskClient", database: "utils.DBFixtures"
 ):
@@ -189,6 +217,14 @@ def test_enroll_hardware(mocker, user_auth_headers, client: "FlaskClient"):
             {"name": "fake-name", "hardware_type": utils.FAKE_HARDWARE_TYPE},
             id="no_properties",
         ),
+        pytest.param(
+            {
+                "name": "fake-name",
+                "hardware_type": "unknown-hardware-type",
+                "properties": {},
+            },
+            id="unknown_hardware_type",
+        ),
         pytest.param(
             {"name": "fake-name"},
             id="no_hardware_type",
@@ -115,3 +115,15 @@ def test_no_driver_load_error_if_driver_disabled(
         },
     )
     assert factory().names == ["fake-ok"]
+
+
+def test_drivers_rebuilt_with_extension_manager(mocker: "MockerFixture", set_config):
+    """Test that the driver mapping is reused until the factory is reloaded."""
+    set_config(enabled_hardware_types=["fake-ok"])
+    utils.mock_drivers(mocker, {"doni.driver.hardware_type": {"fake-ok": TestDriver}})
+    drivers = driver_factory.hardware_types()
+    assert isinstance(drivers["fake-ok"], TestDriver)
+    assert driver_factory.hardware_types() is drivers
+
+    driver_factory.HardwareTypeFactory._extension_manager = None
+    assert driver_factory.hardware_types() is not drivers
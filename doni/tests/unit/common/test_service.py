@@ -0,0 +1,13 @@
+import subprocess
+import sys
+
+
+def test_import_does_not_load_objects():
+    """Test that importing the service module does not load the object registry."""
+    code = (
+        "import sys\n"
+        "import doni.common.service\n"
+        "loaded = [m for m in ('doni.objects', 'sqlalchemy') if m in sys.modules]\n"
+        "assert not loaded, loaded\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,41 @@
+import pytest
+
+from doni.common import exception
+from doni.common import wsgi
+
+
+@pytest.fixture
+def mock_server(mocker):
+    mocker.patch("doni.common.wsgi.create_app")
+    return mocker.patch("doni.common.wsgi.wsgi.Server")
+
+
+def test_worker_connections_default(test_config, mock_server):
+    """Test that the server's default pool size is kept, even above the DB pool."""
+    test_config.config(group="database", max_pool_size=10, max_overflow=5)
+    service = wsgi.WSGIService("doni_api")
+    assert service.worker_connections is None
+    assert mock_server.call_args.kwargs["pool_size"] is None
+
+
+def test_worker_connections_within_pool(test_config, mock_server):
+    test_config.config(group="database", max_pool_size=10, max_overflow=5)
+    test_config.config(group="api", worker_connections=15)
+    service = wsgi.WSGIService("doni_api")
+    assert service.worker_connections == 15
+    assert mock_server.call_args.kwargs["pool_size"] == 15
+
+
+def test_worker_connections_unbounded_overflow(test_config, mock_server):
+    test_config.config(group="database", max_pool_size=10, max_overflow=-1)
+    test_config.config(group="api", worker_connections=500)
+    service = wsgi.WSGIService("doni_api")
+    assert service.worker_connections == 500
+    assert mock_server.call_args.kwargs["pool_size"] == 500
+
+
+def test_worker_connections_exceed_pool(test_config, mock_server):
+    test_config.config(group="database", max_pool_size=10, max_overflow=5)
+    test_config.config(group="api", worker_connections=16)
+    with pytest.raises(exception.ConfigInvalid):
+        wsgi.WSGIService("doni_api")
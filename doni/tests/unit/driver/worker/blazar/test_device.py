@@ -65,6 +65,8 @@ def blazar_worker(test_config):
         password="fake-password",
         project_name="fake-project-name",
         project_domain_name="fake-project-domain-name",
+        # Each test stubs its own set of leases.
+        lease_list_cache_ttl=0,
     )
     return worker
 
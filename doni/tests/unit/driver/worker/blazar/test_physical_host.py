@@ -1,5 +1,6 @@
 """Unit tests for blazar sync worker."""
 from datetime import timedelta
+import time
 from typing import TYPE_CHECKING
 from unittest import mock
 
@@ -7,6 +8,7 @@ import pytest
 from keystoneauth1 import loading as ks_loading
 from oslo_utils import uuidutils
 
+from doni.driver.worker import blazar
 from doni.driver.worker.blazar import AW_LEASE_PREFIX
 from doni.driver.worker.blazar.physical_host import BlazarPhysicalHostWorker
 from doni.objects.availability_window import AvailabilityWindow
@@ -63,6 +65,8 @@ def blazar_worker(test_config):
         password="fake-password",
         project_name="fake-project-name",
         project_domain_name="fake-project-domain-name",
+        # Each test stubs its own set of leases.
+        lease_list_cache_ttl=0,
     )
     return worker
 
@@ -497,6 +501,134 @@ def test_update_lease(
     assert blazar_request.call_count == call_count
 
 
+def test_lease_list_cached(
+    mocker,
+    test_config,
+    admin_context: "RequestContext",
+    blazar_worker: "BlazarPhysicalHostWorker",
+    database: "utils.DBFixtures",
+):
+    """Test that a recent lease listing is reused by the next sync."""
+    test_config.config(group="blazar", lease_list_cache_ttl=60)
+    mocker.patch.object(blazar, "_LEASE_LIST", None)
+    hw_obj = get_fake_hardware(database)
+    fake_window = database.add_availability_window(hardware_uuid=hw_obj.uuid)
+    aw_obj = AvailabilityWindow(**fake_window)
+    fake_lease = _fake_lease(aw_obj)
+
+    def _stub_blazar_request(path, method=None, json=None, **kwargs):
+        lease_response = _stub_blazar_lease_existing(path, method, json, fake_lease)
+        if lease_response:
+            return lease_response
+
+        host_response = _stub_blazar_host_exist(path, method, json)
+        if host_response:
+            return host_response
+
+        raise NotImplementedError(f"Unexpected request signature: {method} {path}")
+
+    blazar_request = get_mocked_blazar(mocker, _stub_blazar_request)
+    for _ in range(2):
+        result = blazar_worker.process(
+            context=admin_context,
+            hardware=hw_obj,
+            availability_windows=[aw_obj],
+            state_details=TEST_STATE_DETAILS,
+        )
+        assert isinstance(result, WorkerResult.Success)
+
+    lease_list_calls = [
+        call
+        for call in blazar_request.call_args_list
+        if call.args[0] == "/leases" and call.kwargs.get("method") == "get"
+    ]
+    assert len(lease_list_calls) == 1
+
+
+def test_lease_list_not_stored_after_invalidation(
+    mocker,
+    test_config,
+    admin_context: "RequestContext",
+    blazar_worker: "BlazarPhysicalHostWorker",
+    database: "utils.DBFixtures",
+):
+    """Test that a listing which raced with a lease change is not reused."""
+    test_config.config(group="blazar", lease_list_cache_ttl=60)
+    mocker.patch.object(blazar, "_LEASE_LIST", None)
+    hw_obj = get_fake_hardware(database)
+
+    def _stub_blazar_request(path, method=None, json=None, **kwargs):
+        if path == "/leases" and method == "get":
+            # Another sync changes a lease while this listing is in flight.
+            blazar._invalidate_lease_list()
+            return utils.MockResponse(200, {"leases": []})
+        raise NotImplementedError(f"Unexpected request signature: {method} {path}")
+
+    get_mocked_blazar(mocker, _stub_blazar_request)
+    assert blazar_worker._lease_list(admin_context, hw_obj) == []
+    assert blazar._LEASE_LIST is None
+
+
+@pytest.mark.parametrize("has_window", [True, False])
+def test_cached_lease_already_gone(
+    mocker,
+    test_config,
+    admin_context: "RequestContext",
+    blazar_worker: "BlazarPhysicalHostWorker",
+    database: "utils.DBFixtures",
+    has_window: "bool",
+):
+    """Test syncing against a cached lease that was since deleted from Blazar.
+
+    Cases:
+        1. The lease needs an update, so it is created again.
+        2. The lease is no longer wanted, and deleting it succeeds.
+    """
+    test_config.config(group="blazar", lease_list_cache_ttl=60)
+    hw_obj = get_fake_hardware(database)
+    fake_window = database.add_availability_window(hardware_uuid=hw_obj.uuid)
+    aw_obj = AvailabilityWindow(**fake_window)
+    stale_lease = _fake_lease(aw_obj)
+    # Change end time to force lease update
+    stale_lease["end_date"] = (aw_obj.end + timedelta(days=1)).isoformat()
+    mocker.patch.object(blazar, "_LEASE_LIST", (time.monotonic(), [stale_lease]))
+    lease_path = f"/leases/{stale_lease['id']}"
+
+    def _stub_blazar_request(path, method=None, json=None, **kwargs):
+        if path == lease_path and method in ("put", "delete"):
+            return utils.MockResponse(404)
+        elif path == "/leases" and method == "post":
+            return utils.MockResponse(
+                201, {"lease": {"created_at": "fake-created_at"}}
+            )
+
+        host_response = _stub_blazar_host_exist(path, method, json)
+        if host_response:
+            return host_response
+
+        raise NotImplementedError(f"Unexpected request signature: {method} {path}")
+
+    blazar_request = get_mocked_blazar(mocker, _stub_blazar_request)
+    result = blazar_worker.process(
+        context=admin_context,
+        hardware=hw_obj,
+        availability_windows=[aw_obj] if has_window else [],
+        state_details=TEST_STATE_DETAILS,
+    )
+
+    assert isinstance(result, WorkerResult.Success)
+    lease_calls = [
+        (call.args[0], call.kwargs.get("method"))
+        for call in blazar_request.call_args_list
+        if call.args[0].startswith("/leases")
+    ]
+    if has_window:
+        assert lease_calls == [(lease_path, "put"), ("/leases", "post")]
+    else:
+        assert lease_calls == [(lease_path, "delete")]
+    assert blazar._LEASE_LIST is None
+
+
 @pytest.mark.parametrize(
     "lease_prefix,result_type,call_count",
     [
@@ -0,0 +1,94 @@
+import sys
+import types
+from unittest import mock
+
+import pytest
+import requests
+
+from doni.driver.worker import balena as balena_worker
+from doni.driver.worker.balena import BalenaWorker
+
+
+@pytest.fixture
+def fake_balena(mocker, test_config):
+    """Stand in for the optional Balena SDK, keeping its requests module hook."""
+    BalenaWorker().register_opts(test_config)
+    test_config.config(group="balena", api_token="fake-token", http_pool_size=4)
+    mocker.patch.object(balena_worker, "BALENA_SDK", None)
+
+    base_request = types.SimpleNamespace(requests=requests)
+    sdk_module = types.ModuleType("balena")
+    sdk_module.Balena = mock.MagicMock()
+    sdk_module.base_request = base_request
+    mocker.patch.dict(sys.modules, {"balena": sdk_module})
+    return sdk_module
+
+
+def test_pooled_requests():
+    """Test that request methods use the session and everything else the module."""
+    session = mock.MagicMock()
+    pooled = balena_worker._PooledRequests(session)
+    pooled.post("https://balena.example.com/device", json={})
+    session.post.assert_called_once_with("https://balena.example.com/device", json={})
+    assert pooled.exceptions is requests.exceptions
+
+
+def test_http_session(test_config):
+    """Test that the session keeps up to http_pool_size connections per host."""
+    BalenaWorker().register_opts(test_config)
+    test_config.config(group="balena", http_pool_size=4)
+    adapter = balena_worker._http_session().get_adapter("https://balena.example.com")
+    assert adapter._pool_maxsize == 4
+    assert adapter.max_retries.total == 0
+
+
+def test_get_balena_sdk_pools_requests(mocker, fake_balena):
+    """Test that SDK requests are sent over the shared session."""
+    session = mock.MagicMock()
+    mocker.patch.object(balena_worker, "_http_session", return_value=session)
+
+    sdk = balena_worker._get_balena_sdk()
+
+    assert sdk is fake_balena.Balena.return_value
+    sdk.auth.login_with_token.assert_called_once_with("fake-token")
+    assert balena_worker._get_balena_sdk() is sdk
+    fake_balena.Balena.assert_called_once()
+
+    # This is how the SDK's base_request module sends its API calls.
+    fake_balena.base_request.requests.request("GET", "https://balena.example.com")
+    session.request.assert_called_once_with("GET", "https://balena.example.com")
+
+
+def test_get_balena_sdk_unpatchable(mocker, fake_balena):
+    """Test that a warning is logged if the SDK's requests hook is missing."""
+    del fake_balena.base_request.requests
+    mock_log = mocker.patch.object(balena_worker, "LOG")
+
+    balena_worker._get_balena_sdk()
+
+    mock_log.warning.assert_called_once()
+
+
+def test_sdk_requests_use_pooled_session(mocker, test_config):
+    """Test that the Balena SDK's own API calls are sent over the shared session."""
+    base_request = pytest.importorskip("balena.base_request")
+    BalenaWorker().register_opts(test_config)
+    test_config.config(group="balena", api_token="fake-token")
+    mocker.patch.object(balena_worker, "BALENA_SDK", None)
+    mocker.patch("balena.Balena")
+    # Restore the SDK's own requests module after the test.
+    mocker.patch.object(base_request, "requests", base_request.requests)
+    mocker.patch.object(base_request, "Settings")
+    session = mock.MagicMock()
+    session.get.return_value.status_code = 200
+    session.get.return_value.json.return_value = {"d": []}
+    mocker.patch.object(balena_worker, "_http_session", return_value=session)
+
+    balena_worker._get_balena_sdk()
+    response = base_request.BaseRequest().request(
+        "device", "GET", endpoint="https://balena.example.com/", auth=False
+    )
+
+    assert response == {"d": []}
+    session.get.assert_called_once()
+    assert session.get.call_args.args[0] == "https://balena.example.com/device"
@@ -95,3 +95,46 @@ def test_list_with_deleted(admin_context, database: "utils.DBFixtures"):
     database.add_hardware(deleted=1, deleted_at=timeutils.utcnow())
     hardwares = Hardware.list(admin_context)
     assert not hardwares
+
+
+def test_list_paginated(admin_context, existing_hardwares):
+    """Test that pages pick up after the marker without skipping or repeating."""
+    first_page = Hardware.list(admin_context, limit=2)
+    assert len(first_page) == 2
+    second_page = Hardware.list(admin_context, limit=2, marker=first_page[-1].uuid)
+    assert len(second_page) == 1
+    assert {hw.uuid for hw in first_page + second_page} == {
+        hw["uuid"] for hw in existing_hardwares
+    }
+
+
+@pytest.mark.parametrize("sort_dir", ["asc", "desc"])
+def test_list_paginated_nullable_key(
+    admin_context, database: "utils.DBFixtures", sort_dir
+):
+    """Test paging on a sort key where some rows are NULL."""
+    database.add_hardware()
+    database.add_hardware(updated_at=timeutils.utcnow())
+    database.add_hardware()
+    database.add_hardware(updated_at=timeutils.utcnow())
+    seen = []
+    marker = None
+    while True:
+        page = Hardware.list(
+            admin_context,
+            limit=1,
+            marker=marker,
+            sort_key="updated_at",
+            sort_dir=sort_dir,
+        )
+        if not page:
+            break
+        seen.extend(hw.uuid for hw in page)
+        marker = page[-1].uuid
+    assert sorted(seen) == sorted(hw["uuid"] for hw in database.hardwares)
+
+
+def test_list_invalid_marker(admin_context, existing_hardwares):
+    """Test that an unknown marker is rejected."""
+    with pytest.raises(exception.InvalidParameterValue):
+        Hardware.list(admin_context, marker="not-a-real-uuid")
@@ -24,10 +24,21 @@ def test_list_for_hardware(admin_context, database: "utils.DBFixtures"):
     assert len(tasks) == 1
 
 
+def test_list_for_new_hardware(admin_context, database: "utils.DBFixtures"):
+    hw = database.add_hardware()
+    tasks = WorkerTask.list_for_hardware(admin_context, hw["uuid"])
+    assert tasks[0].state == WorkerState.PENDING
+    assert tasks[0].state_details == {}
+    assert len(WorkerTask.list_pending(admin_context)) == 1
+
+
+@pytest.mark.parametrize("filter_in_db", [False, True])
 def test_list_for_hardware_disabled_workers(
-    test_config, admin_context, database: "utils.DBFixtures"
+    test_config, admin_context, database: "utils.DBFixtures", filter_in_db
 ):
-    test_config.config(enabled_worker_types=[])
+    test_config.config(
+        enabled_worker_types=[], filter_worker_types_in_db=filter_in_db
+    )
     hw = database.add_hardware()
     tasks = WorkerTask.list_for_hardware(admin_context, hw["uuid"])
     assert len(tasks) == 0
@@ -172,3 +172,26 @@ def test_batching(
         assert len(set(worked_on[10 * i : (10 * (i + 1))])) == 1
 
     assert len(WorkerTask.list_pending(admin_context)) == 0
+
+
+def test_process_pending_stops_between_batches(
+    mocker: "MockerFixture",
+    test_config: "ConfigFixture",
+    manager: "WorkerManager",
+    admin_context: "RequestContext",
+    database: "utils.DBFixtures",
+):
+    for _ in range(3):
+        database.add_hardware()
+    test_config.config(group="worker", task_concurrency=1)
+
+    def process(context: "RequestContext", hardware, **kwargs):
+        # Simulate a shutdown request arriving while the first batch runs.
+        manager._shutdown = True
+        return WorkerResult.Success()
+
+    mocker.patch.object(FakeWorker, "process").side_effect = process
+
+    manager.process_pending(admin_context)
+
+    assert len(WorkerTask.list_pending(admin_context)) == 2
@@ -84,6 +84,16 @@ class WorkerField(object):
             and contents.
     """
 
+    __slots__ = (
+        "name",
+        "schema",
+        "default",
+        "required",
+        "private",
+        "sensitive",
+        "description",
+    )
+
     def __init__(
         self,
         name,
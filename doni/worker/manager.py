@@ -149,6 +149,12 @@ class WorkerManager(object):
         )
 
         for i, batch in enumerate(chunked_batches):
+            if self._shutdown:
+                # Let the current batch finish, but don't start any new work;
+                # remaining tasks are still pending and will be picked up on
+                # the next start.
+                LOG.info("Worker is stopping, skipping remaining task batches.")
+                break
             batch_futures = waiters.wait_for_all(
                 [
                     self._spawn_worker(